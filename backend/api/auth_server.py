@@ -428,6 +428,31 @@ async def get_user_documents_endpoint(
             detail="Failed to get documents"
         )
 
+@app.get("/users/dashboard")
+async def get_user_dashboard_endpoint(
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Get profile, applications and documents for current user in one response
+
+    Each part fails on its own: a failed part keeps its empty default and its
+    error detail is reported under "errors".
+    """
+    dashboard = {"profile": None, "applications": [], "documents": [], "errors": {}}
+    parts = (
+        ("profile", get_user_profile, None),
+        ("applications", get_user_applications_endpoint, "applications"),
+        ("documents", get_user_documents_endpoint, "documents"),
+    )
+    for part, fetch, key in parts:
+        try:
+            result = await fetch(current_user)
+        except HTTPException as e:
+            dashboard["errors"][part] = e.detail
+            continue
+        dashboard[part] = result[key] if key else result
+
+    return dashboard
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -7,6 +7,8 @@ import httpx
 import json
 import os
 
+from backend.api.schemas import ChatRequest
+
 # Simple settings without complex imports
 class SimpleSettings:
     def __init__(self):
@@ -118,6 +120,12 @@ Keep responses under 50 words. Use emojis and be friendly."""
             if context:
                 if context.get("application_id"):
                     enhanced_prompt = f"User has application ID {context['application_id']}. {prompt}"
+                if context.get("recent_turns"):
+                    history = "\n".join(
+                        f"{turn.get('role', 'user')}: {turn.get('content', '')}"
+                        for turn in context["recent_turns"]
+                    )
+                    enhanced_prompt = f"Recent conversation:\n{history}\n\n{enhanced_prompt}"
 
             async with httpx.AsyncClient(timeout=self.timeout) as client:
                 payload = {
@@ -191,22 +199,21 @@ async def root():
     }
 
 @app.post("/chat/message")
-async def chat_message(
-    message: str,
-    application_id: Optional[int] = None
-):
+async def chat_message(request: ChatRequest):
     """Send a message to the AI chatbot and get an intelligent response"""
+    message = request.message
     try:
         # Build context
         context = {}
-        if application_id:
-            context["application_id"] = application_id
+        if request.application_id:
+            context["application_id"] = request.application_id
+        if request.recent_turns:
+            context["recent_turns"] = request.recent_turns
 
         # Get LLM response
         response = await llm_service.get_response(message, context)
 
         return {
-            "message": message,
             "response": response,
             "timestamp": datetime.now().isoformat(),
             "context_used": bool(context),
@@ -216,7 +223,6 @@ async def chat_message(
     except Exception as e:
         logger.error(f"Chat message failed: {str(e)}")
         return {
-            "message": message,
             "response": "I'm here to help with your social support application. Could you please rephrase your question?",
             "timestamp": datetime.now().isoformat(),
             "context_used": False,
@@ -17,6 +17,7 @@ from backend.models import (
     ApplicationDB, ApplicantDB, DocumentDB,
     ApplicationStatus, DocumentType
 )
+from backend.api.schemas import ChatRequest
 from backend.agents import orchestrator
 from backend.services import document_processor, ocr_service, embedding_service, llm_service
 
@@ -45,6 +46,9 @@ app.add_middleware(
 # Security
 security = HTTPBearer(auto_error=False)
 
+# Maximum number of uploaded files written to disk at the same time
+UPLOAD_CONCURRENCY = 4
+
 # Global variables for tracking processing status
 processing_status_cache: Dict[int, Dict[str, Any]] = {}
 
@@ -147,23 +151,28 @@ async def upload_documents(
         if not application:
             raise HTTPException(status_code=404, detail="Application not found")
 
-        uploaded_docs = []
-
-        for i, file in enumerate(files):
-            # Determine document type
-            doc_type = document_types[i] if document_types and i < len(document_types) else "general"
-
-            # Validate file
+        # Validate every file before writing any of them
+        for file in files:
             if file.size > settings.max_file_size:
                 raise HTTPException(status_code=413, detail=f"File {file.filename} too large")
 
-            # Save file
-            file_content = await file.read()
-            file_path = await document_processor.save_uploaded_file(
-                file_content, file.filename, application_id
-            )
+        # Save files concurrently (bounded) so disk writes overlap
+        save_slots = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+
+        async def save_file(file: UploadFile) -> str:
+            async with save_slots:
+                return await document_processor.save_upload_stream(
+                    file, file.filename, application_id
+                )
+
+        file_paths = await asyncio.gather(*(save_file(file) for file in files))
+
+        # Create document records in a single transaction
+        documents = []
+        for i, (file, file_path) in enumerate(zip(files, file_paths)):
+            # Determine document type
+            doc_type = document_types[i] if document_types and i < len(document_types) else "general"
 
-            # Create document record
             document_data = {
                 "application_id": application_id,
                 "document_type": doc_type,
@@ -175,9 +184,13 @@ async def upload_documents(
 
             document = DocumentDB(**document_data)
             db.add(document)
-            db.commit()
-            db.refresh(document)
+            documents.append((document, file, doc_type))
 
+        db.commit()
+
+        uploaded_docs = []
+        for document, file, doc_type in documents:
+            db.refresh(document)
             uploaded_docs.append({
                 "document_id": document.id,
                 "filename": file.filename,
@@ -501,37 +514,44 @@ async def get_analytics_stats():
 
 # Chat Endpoints
 
+def build_chat_context(application_id: Optional[int], db: Session) -> Dict[str, Any]:
+    """Look up the application state the chatbot should know about"""
+    context = {}
+
+    if application_id:
+        context["application_id"] = application_id
+
+        # Get application status if available
+        if application_id in processing_status_cache:
+            status_data = processing_status_cache[application_id]
+            context["processing_status"] = status_data.get("status")
+            context["has_documents"] = status_data.get("documents_uploaded", 0) > 0
+
+        # Check if application exists in database
+        application = db.query(ApplicationDB).filter(ApplicationDB.id == application_id).first()
+        if application:
+            context["application_type"] = application.application_type
+            context["application_status"] = application.status
+
+    return context
+
 @app.post("/chat/message")
 async def chat_message(
-    message: str,
-    application_id: Optional[int] = None,
+    request: ChatRequest,
     db: Session = Depends(get_db)
 ):
     """Send a message to the AI chatbot and get an intelligent response"""
+    message = request.message
     try:
-        # Build context for the LLM
-        context = {}
-
-        if application_id:
-            context["application_id"] = application_id
-
-            # Get application status if available
-            if application_id in processing_status_cache:
-                status_data = processing_status_cache[application_id]
-                context["processing_status"] = status_data.get("status")
-                context["has_documents"] = status_data.get("documents_uploaded", 0) > 0
+        context = build_chat_context(request.application_id, db)
 
-            # Check if application exists in database
-            application = db.query(ApplicationDB).filter(ApplicationDB.id == application_id).first()
-            if application:
-                context["application_type"] = application.application_type
-                context["application_status"] = application.status
+        if request.recent_turns:
+            context["recent_turns"] = request.recent_turns
 
         # Get LLM response
         response = await llm_service.get_chat_response(message, context)
 
         return {
-            "message": message,
             "response": response,
             "timestamp": datetime.now().isoformat(),
             "context_used": bool(context)
@@ -541,7 +561,6 @@ async def chat_message(
         logger.error(f"Chat message failed: {str(e)}")
         # Return fallback response instead of error
         return {
-            "message": message,
             "response": "I'm here to help with your social support application. Could you please rephrase your question? I can assist with applications, documents, eligibility, and status updates.",
             "timestamp": datetime.now().isoformat(),
             "context_used": False,
@@ -0,0 +1,12 @@
+"""
+Request models shared by the API servers
+"""
+
+from pydantic import BaseModel
+from typing import Optional, Dict, List
+
+class ChatRequest(BaseModel):
+    """Body of POST /chat/message"""
+    message: str
+    application_id: Optional[int] = None
+    recent_turns: List[Dict[str, str]] = []
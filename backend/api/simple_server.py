@@ -7,6 +7,8 @@ from datetime import datetime
 import uuid
 import json
 import os
+import asyncio
+import hashlib
 import shutil
 
 # Import authentication utilities
@@ -58,6 +60,9 @@ DATA_DIR = "data/temp"
 APPLICATIONS_FILE = os.path.join(DATA_DIR, "applications.json")
 PROCESSING_FILE = os.path.join(DATA_DIR, "processing.json")
 
+# Upper bound on how long a status long-poll may block (seconds)
+STATUS_LONG_POLL_MAX = 30
+
 def ensure_data_dir():
     """Create data directory if it doesn't exist"""
     os.makedirs(DATA_DIR, exist_ok=True)
@@ -599,15 +604,32 @@ async def process_application(
 
         raise HTTPException(status_code=500, detail=error_msg)
 
+def _status_version(status: Dict[str, Any]) -> str:
+    """Stable fingerprint of a status payload, used for long-polling"""
+    return hashlib.md5(json.dumps(status, sort_keys=True, default=str).encode()).hexdigest()
+
 @app.get("/applications/{application_id}/status")
-async def get_application_status(application_id: int):
-    """Get current processing status of an application"""
+async def get_application_status(application_id: int, wait: int = 0, since: Optional[str] = None):
+    """Get current processing status of an application
+
+    With ``wait`` > 0 and ``since`` set to the last seen version, the request
+    blocks until the status changes or ``wait`` seconds (max 30) elapse.
+    """
     try:
         if application_id not in processing_status_cache:
             raise HTTPException(status_code=404, detail="Application status not found")
 
         status = processing_status_cache[application_id]
-        return status
+        version = _status_version(status)
+
+        if since and wait > 0:
+            deadline = asyncio.get_running_loop().time() + min(wait, STATUS_LONG_POLL_MAX)
+            while version == since and asyncio.get_running_loop().time() < deadline:
+                await asyncio.sleep(0.5)
+                status = processing_status_cache.get(application_id, status)
+                version = _status_version(status)
+
+        return {**status, "version": version}
 
     except HTTPException:
         raise
@@ -643,6 +665,7 @@ async def get_application_details(
                         applicant_data = json.loads(application.applicant_data) if isinstance(application.applicant_data, str) else application.applicant_data
                     except:
                         applicant_data = {}
+                    applicant_data = applicant_data or {}
 
                     # Get processing status
                     processing_status = processing_status_cache.get(application_id, {})
@@ -653,7 +676,8 @@ async def get_application_details(
                             "type": application.application_type,
                             "status": application.status,
                             "submitted_at": application.submitted_at.isoformat(),
-                            "processed_at": application.processed_at.isoformat() if application.processed_at else None
+                            "processed_at": application.processed_at.isoformat() if application.processed_at else None,
+                            "applicant_data": applicant_data
                         },
                         "applicant": {
                             "id": application.id,
@@ -691,7 +715,8 @@ async def get_application_details(
                 "type": applicant_data.get("application_type", "financial_support"),
                 "status": application["status"],
                 "submitted_at": application["submitted_at"],
-                "processed_at": application.get("processed_at")
+                "processed_at": application.get("processed_at"),
+                "applicant_data": applicant_data
             },
             "applicant": {
                 "id": application_id,
@@ -6,6 +6,7 @@ import asyncio
 import aiofiles
 from datetime import datetime
 import json
+import uuid
 
 from unstructured.partition.auto import partition
 from unstructured.partition.pdf import partition_pdf
@@ -17,6 +18,9 @@ import pandas as pd
 from backend.config import settings
 from backend.models.schemas import DocumentType
 
+# Read size when streaming uploads to disk
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
 class DocumentProcessor:
     """
     Unified document processing service supporting multiple file types:
@@ -54,22 +58,38 @@ class DocumentProcessor:
             DocumentType.ASSETS_LIABILITIES: self._extract_assets_liabilities
         }
 
-    async def save_uploaded_file(self, file_content: bytes, filename: str, application_id: int) -> str:
-        """Save uploaded file to disk and return file path"""
+    def _upload_path(self, filename: str, application_id: int) -> Path:
+        """Destination path for an uploaded file"""
         app_dir = self.upload_dir / str(application_id)
         app_dir.mkdir(exist_ok=True)
 
-        # Ensure unique filename
+        # Ensure unique filename; the timestamp only has second resolution, so a
+        # random suffix keeps same-named files saved together (e.g. one batch
+        # written concurrently) from sharing a path
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         name, ext = os.path.splitext(filename)
-        safe_filename = f"{name}_{timestamp}{ext}"
-        file_path = app_dir / safe_filename
+        safe_filename = f"{name}_{timestamp}_{uuid.uuid4().hex[:8]}{ext}"
+        return app_dir / safe_filename
+
+    async def save_uploaded_file(self, file_content: bytes, filename: str, application_id: int) -> str:
+        """Save uploaded file to disk and return file path"""
+        file_path = self._upload_path(filename, application_id)
 
         async with aiofiles.open(file_path, 'wb') as f:
             await f.write(file_content)
 
         return str(file_path)
 
+    async def save_upload_stream(self, upload, filename: str, application_id: int) -> str:
+        """Copy an upload (anything with async read(n), e.g. UploadFile) to disk in chunks and return file path"""
+        file_path = self._upload_path(filename, application_id)
+
+        async with aiofiles.open(file_path, 'wb') as f:
+            while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+                await f.write(chunk)
+
+        return str(file_path)
+
     async def process_document(
         self,
         file_path: str,
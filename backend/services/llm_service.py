@@ -96,6 +96,12 @@ Respond in a helpful, concise manner. Use emojis sparingly for clarity. If you d
                 prompt = f"User has uploaded documents. {prompt}"
             if context.get("processing_status"):
                 prompt = f"User's application status is {context['processing_status']}. {prompt}"
+            if context.get("recent_turns"):
+                history = "\n".join(
+                    f"{turn.get('role', 'user')}: {turn.get('content', '')}"
+                    for turn in context["recent_turns"]
+                )
+                prompt = f"Recent conversation:\n{history}\n\n{prompt}"
 
         # Try to get LLM response
         llm_response = await self._make_request(prompt)
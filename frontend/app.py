@@ -1,14 +1,27 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+import re
 import json
-from typing import Dict, Any, List
-from datetime import datetime
-import pandas as pd
+import hashlib
+import threading
+from bisect import bisect_right
+from itertools import accumulate, islice
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple, Callable
+from datetime import date, datetime
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # optional C serializer; fall back to requests' stdlib json
+    orjson = None
 
 # Import authentication components
 from auth_components import check_authentication, save_session_to_url, get_auth_headers
-from user_dashboard import show_user_profile, show_application_history
 
 # Configure Streamlit page
 st.set_page_config(
@@ -22,36 +35,281 @@ st.set_page_config(
 API_BASE_URL = "http://localhost:8000"
 CHAT_API_URL = "http://localhost:8001"
 
+STATIC_DIR = Path(__file__).parent / "static"
+
+# (connect, read) timeout applied to every backend call that doesn't set its own
+DEFAULT_TIMEOUT = (3.05, 30)
+# Statuses that no longer change on their own; cached longer
+TERMINAL_STATUSES = ("completed", "failed")
+# Auto-refresh interval of the sidebar status fragment while processing
+STATUS_REFRESH_SECONDS = 5
+# Auto-refresh interval of the Results tab while processing
+RESULTS_REFRESH_SECONDS = 2
+# Previous chat turns sent along with each new message
+CHAT_CONTEXT_TURNS = 4
+# Chat messages rendered by default; older ones are behind a toggle
+CHAT_VISIBLE_MESSAGES = 20
+
+# Document types offered per uploaded file, with their display labels
+DOC_TYPE_LABELS = {
+    "emirates_id": "🆔 Emirates ID",
+    "bank_statement": "🏦 Bank Statement",
+    "credit_report": "📊 Credit Report",
+    "resume": "📄 Resume/CV",
+    "assets_liabilities": "💰 Assets & Liabilities",
+    "salary_certificate": "💼 Salary Certificate",
+    "trade_license": "🏢 Trade License",
+    "passport": "📘 Passport",
+    "visa": "🛂 Visa",
+    "utility_bill": "⚡ Utility Bill",
+    "rental_agreement": "🏠 Rental Agreement",
+    "family_book": "👨‍👩‍👧‍👦 Family Book",
+    "medical_report": "🏥 Medical Report",
+    "insurance_policy": "🛡️ Insurance Policy",
+    "other": "📎 Other Document",
+}
+DOC_TYPE_OPTIONS = tuple(DOC_TYPE_LABELS)
+# SelectboxColumn shows raw option values, so the upload table edits labels
+_DOC_TYPE_BY_LABEL = {label: doc_type for doc_type, label in DOC_TYPE_LABELS.items()}
+# Stored documents may also carry the backend's "general" fallback type
+UPLOADED_DOC_TYPE_LABELS = {**DOC_TYPE_LABELS, "general": "📎 General Document"}
+# Columns shown in the Results tab's uploaded-documents table
+DOCUMENT_TABLE_COLUMNS = ("type", "filename", "size", "uploaded_at")
+
+# Form validators, compiled once; the branchy checks only run to explain a failure
+_EMIRATES_ID_SEPARATORS_RE = re.compile(r"[- ]")
+_EMIRATES_ID_RE = re.compile(r"784\d{12}")
+_EMAIL_RE = re.compile(r"[^@].*@[^@]*\.[^@]*")
+_PHONE_SEPARATORS_RE = re.compile(r"[+ \-()]")
+
+# Application form select options and their saved-value -> index lookups
+# (immutable tuples, so every rerun hands the widgets the same objects)
+URGENCY_OPTIONS = ("normal", "high", "critical")
+APPLICATION_TYPE_OPTIONS = ("financial_support", "economic_enablement")
+EMPLOYMENT_OPTIONS = ("employed", "unemployed", "self_employed", "student", "retired")
+APPLICATION_TYPE_LABELS = {
+    "financial_support": "Financial Support",
+    "economic_enablement": "Economic Enablement",
+}
+_URGENCY_INDEX = {option: i for i, option in enumerate(URGENCY_OPTIONS)}
+_APPLICATION_TYPE_INDEX = {option: i for i, option in enumerate(APPLICATION_TYPE_OPTIONS)}
+_EMPLOYMENT_INDEX = {option: i for i, option in enumerate(EMPLOYMENT_OPTIONS)}
+
+# Form fields restored from the backend, with their defaults
+_FORM_FIELD_DEFAULTS = {
+    "first_name": "",
+    "last_name": "",
+    "emirates_id": "",
+    "email": "",
+    "phone": "",
+    "date_of_birth": "",
+    "address": "",
+    "family_size": 1,
+    "urgency_level": "normal",
+    "application_type": "financial_support",
+    "monthly_income": 0,
+    "employment_status": "employed",
+    "bank_balance": 0,
+    "has_existing_support": False,
+}
+
+def _check_name(label: str) -> Callable[[str], Tuple[Optional[str], Optional[str]]]:
+    def check(value: str) -> Tuple[Optional[str], Optional[str]]:
+        return (f"{label} must be at least 2 characters" if len(value) < 2 else None), None
+    return check
+
+def _check_emirates_id(value: str) -> Tuple[Optional[str], Optional[str]]:
+    # Emirates ID format validation (784-XXXX-XXXXXXX-X)
+    clean_emirates_id = _EMIRATES_ID_SEPARATORS_RE.sub("", value)
+    if _EMIRATES_ID_RE.fullmatch(clean_emirates_id):
+        return None, None
+    if not clean_emirates_id.startswith("784"):
+        return "Emirates ID must start with 784", None
+    if len(clean_emirates_id) != 15:
+        return "Emirates ID must be exactly 15 digits (784-XXXX-XXXXXXX-X)", None
+    return "Emirates ID must contain only digits and dashes", None
+
+def _check_email(value: str) -> Tuple[Optional[str], Optional[str]]:
+    if _EMAIL_RE.fullmatch(value):
+        return None, None
+    if "@" not in value:
+        return "Email must contain @ symbol", None
+    if "." not in value.rsplit("@", 1)[-1]:
+        return "Email domain must contain a period (e.g. .com)", None
+    return "Email must have a username before @", None
+
+def _check_phone(value: str) -> Tuple[Optional[str], Optional[str]]:
+    clean_phone = _PHONE_SEPARATORS_RE.sub("", value)
+    if not clean_phone.isdigit():
+        return "Phone number must contain only digits", None
+    if len(clean_phone) < 10:
+        return "Phone number must be at least 10 digits", None
+    if not clean_phone.startswith(("971", "0")):
+        return None, "UAE phone numbers typically start with +971 or 0"
+    return None, None
+
+# field, label, required, warning when left empty, check(value) -> (error, warning)
+_FORM_FIELD_RULES = (
+    ("first_name", "First name", True, None, _check_name("First name")),
+    ("last_name", "Last name", True, None, _check_name("Last name")),
+    ("emirates_id", "Emirates ID", True, None, _check_emirates_id),
+    ("email", "Email", False, "Email is optional but recommended for updates", _check_email),
+    ("phone", "Phone", False, None, _check_phone),
+)
+
+def validate_form_fields(values: Dict[str, str]) -> Tuple[List[str], List[str]]:
+    """Run the field rules table over the submitted values, returning (errors, warnings)"""
+    errors, warnings = [], []
+    for field, label, required, missing_warning, check in _FORM_FIELD_RULES:
+        value = (values.get(field) or "").strip()
+        if not value:
+            if required:
+                errors.append(f"{label} is required")
+            elif missing_warning:
+                warnings.append(missing_warning)
+            continue
+
+        error, warning = check(value)
+        if error:
+            errors.append(error)
+        if warning:
+            warnings.append(warning)
+    return errors, warnings
+
+def _date_key(day: date) -> int:
+    """A date as a YYYYMMDD integer"""
+    return day.year * 10000 + day.month * 100 + day.day
+
+def validate_applicant_details(address: str, date_of_birth, monthly_income: float,
+                               has_existing_support: bool) -> Tuple[List[str], List[str]]:
+    """Address, age and eligibility checks on the non-text form widgets, returning (errors, warnings)"""
+    errors, warnings = [], []
+
+    # Address validation
+    if address and len(address.strip()) < 10:
+        warnings.append("Address seems short - please provide full address for verification")
+
+    # Age validation from date of birth
+    if date_of_birth:
+        # Whole years between YYYYMMDD integers: exact, and no tuple compare needed
+        age = (_date_key(date.today()) - _date_key(date_of_birth)) // 10000
+        if age < 18:
+            errors.append("Applicant must be at least 18 years old")
+        elif age > 100:
+            errors.append("Please check date of birth - age seems invalid")
+    else:
+        warnings.append("Date of birth is recommended for age verification")
+
+    # Income and eligibility checks
+    if monthly_income > 4000:
+        warnings.append("Monthly income above AED 4,000 may affect eligibility")
+
+    if has_existing_support:
+        warnings.append("Existing government support may affect your application")
+
+    return errors, warnings
+
+# Offline chat fallback: topics are tried in priority order and the first whose
+# keywords appear picks the canned response; greetings must be whole words so
+# "this" or "which" do not count as "hi"
+FALLBACK_RESPONSES = (
+    (re.compile(r"document", re.IGNORECASE), "📄 I can help with documents! You'll need Emirates ID, bank statements, and income proof. Please try again when the AI service is available for more detailed assistance."),
+    (re.compile(r"eligibility", re.IGNORECASE), "✅ Basic eligibility includes UAE residency and monthly income below AED 4,000. Please try again when the AI service is available for detailed criteria."),
+    (re.compile(r"\b(?:hello|hi|hey)\b", re.IGNORECASE), "👋 Hello! I'm your AI Social Support Assistant. The AI service is temporarily slow, but I'm here to help with basic questions."),
+)
+THINKING_MESSAGE = "🤖 *AI is thinking...*"
+DEFAULT_FALLBACK_RESPONSE = "I'm here to help! The AI service is temporarily unavailable, but I can provide basic information about documents, eligibility, or the application process."
+
 # Session state is now initialized in auth_components.init_session_state()
 
+@st.cache_resource
+def load_custom_css() -> str:
+    """Read the app stylesheet once per server process"""
+    return (STATIC_DIR / "app.css").read_text()
+
+@st.cache_resource
+def _http_session(base_url: str) -> requests.Session:
+    """Keep-alive session per backend, shared across reruns and users
+
+    The backends run under uvicorn, which only speaks HTTP/1.1, so an
+    HTTP/2 client would gain nothing here; concurrency comes from the
+    connection pool plus _background_executor instead.
+    """
+    session = requests.Session()
+    # Transient gateway errors are retried for idempotent methods only (urllib3 default)
+    retry = Retry(total=3, backoff_factor=0.2, status_forcelist=(502, 503, 504), raise_on_status=False)
+    # Sized for every Streamlit session thread plus the background executor
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def _request(base_url: str, method: str, path: str, **kwargs) -> requests.Response:
+    """Send a request over the pooled session for base_url"""
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    if orjson is not None and "json" in kwargs:
+        kwargs["data"] = orjson.dumps(kwargs.pop("json"))
+        kwargs["headers"] = {**(kwargs.get("headers") or {}), "Content-Type": "application/json"}
+    return _http_session(base_url).request(method, f"{base_url}{path}", **kwargs)
+
+def _payload_key(*parts: Any) -> str:
+    """Stable digest of a JSON-serializable payload, used as an idempotency key"""
+    if orjson is not None:
+        encoded = orjson.dumps(parts, option=orjson.OPT_SORT_KEYS)
+    else:
+        encoded = json.dumps(parts, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+def _json(response: requests.Response) -> Any:
+    """Decode a JSON response body, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
 def add_chat_message(role: str, content: str):
     """Add a message to the chat history"""
     st.session_state.chat_messages.append({
         "role": role,
         "content": content,
-        "timestamp": datetime.now().strftime("%H:%M:%S")
+        "timestamp": time.strftime("%H:%M:%S")
     })
 
+def _recent_chat_messages(count: int) -> List[Dict[str, Any]]:
+    """Last `count` chat messages as a list (chat history is a deque)"""
+    messages = st.session_state.chat_messages
+    return list(islice(messages, max(len(messages) - count, 0), None))
+
+def _render_chat_message(message: Dict[str, Any]):
+    # One markdown element per turn: content plus a muted timestamp line
+    with st.chat_message(message["role"]):
+        st.markdown(f"{message['content']}\n\n:gray[⏰ {message['timestamp']}]")
+
 def display_chat_messages():
-    """Display chat messages"""
-    for message in st.session_state.chat_messages:
-        with st.chat_message(message["role"]):
-            st.write(message["content"])
-            st.caption(f"⏰ {message['timestamp']}")
+    """Display chat messages, only the most recent ones unless asked for more"""
+    messages = st.session_state.chat_messages
+    hidden = len(messages) - CHAT_VISIBLE_MESSAGES
+    if hidden > 0 and st.toggle(f"Show {hidden} older messages", key="show_older_chat"):
+        for message in islice(messages, hidden):
+            _render_chat_message(message)
+
+    for message in _recent_chat_messages(CHAT_VISIBLE_MESSAGES):
+        _render_chat_message(message)
 
 def submit_application(applicant_data: Dict[str, Any]) -> bool:
     """Submit application to backend"""
     try:
         headers = get_auth_headers()
-        response = requests.post(
-            f"{API_BASE_URL}/applications/submit",
+        response = _request(
+            API_BASE_URL, "POST", "/applications/submit",
             json=applicant_data,
             headers=headers
         )
 
         if response.status_code == 200:
-            result = response.json()
+            result = _json(response)
             st.session_state.application_id = result["application_id"]
+            _fetch_application_details.clear()
+            clear_status_cache()
             add_chat_message("assistant", f"✅ Application submitted successfully! Application ID: {result['application_id']}")
             return True
         else:
@@ -68,16 +326,23 @@ def update_application(applicant_data: Dict[str, Any]) -> bool:
         st.error("❌ No application ID available for updating")
         return False
         
+    # A repeated click sends the same payload again; skip the PUT if it was already saved
+    update_key = _payload_key(st.session_state.application_id, applicant_data)
+    if st.session_state.last_update_key == update_key:
+        st.info("No changes to save")
+        return True
+
     try:
-        headers = get_auth_headers()
-        response = requests.put(
-            f"{API_BASE_URL}/applications/{st.session_state.application_id}/update",
+        headers = {**get_auth_headers(), "Idempotency-Key": update_key}
+        response = _request(
+            API_BASE_URL, "PUT", f"/applications/{st.session_state.application_id}/update",
             json=applicant_data,
             headers=headers
         )
         
         if response.status_code == 200:
-            result = response.json()
+            st.session_state.last_update_key = update_key
+            _fetch_application_details.clear()
             add_chat_message("assistant", f"✅ Application {st.session_state.application_id} updated successfully!")
             return True
         else:
@@ -92,25 +357,26 @@ def upload_documents(files: List, document_types: List[str]) -> bool:
     """Upload documents to backend"""
     try:
         # Prepare file information for the simplified backend
-        files_info = []
-        for i, file in enumerate(files):
-            doc_type = document_types[i] if i < len(document_types) else "general"
-            files_info.append({
+        files_info = [
+            {
                 "filename": file.name,
-                "type": doc_type,
+                "type": document_types[i] if i < len(document_types) else "general",
                 "size": file.size,
                 "content_type": file.type
-            })
+            }
+            for i, file in enumerate(files)
+        ]
 
         headers = get_auth_headers()
-        response = requests.post(
-            f"{API_BASE_URL}/applications/{st.session_state.application_id}/documents/upload",
+        response = _request(
+            API_BASE_URL, "POST", f"/applications/{st.session_state.application_id}/documents/upload",
             json=files_info,
             headers=headers
         )
 
         if response.status_code == 200:
-            result = response.json()
+            result = _json(response)
+            _fetch_application_details.clear()
 
             # Create detailed upload summary
             doc_summary = []
@@ -143,18 +409,22 @@ def start_processing() -> bool:
     """Start application processing"""
     try:
         headers = get_auth_headers()
-        response = requests.post(
-            f"{API_BASE_URL}/applications/{st.session_state.application_id}/process",
+        response = _request(
+            API_BASE_URL, "POST", f"/applications/{st.session_state.application_id}/process",
             headers=headers
         )
 
         if response.status_code == 200:
-            result = response.json()
+            result = _json(response)
+            _fetch_application_details.clear()
+            clear_status_cache()
             add_chat_message("assistant", "🔄 Application processing started! This may take a few minutes.")
             return True
         elif response.status_code == 404:
-            st.error("❌ Application not found. Please submit a new application.")
-            st.info("🔄 **To fix this issue:** Go to the Application Form tab and submit your application again.")
+            st.error(
+                "❌ Application not found. Please submit a new application.\n\n"
+                "🔄 **To fix this issue:** Go to the Application Form tab and submit your application again."
+            )
             # Reset application state
             if st.button("🔄 Reset Application State"):
                 st.session_state.application_submitted = False
@@ -164,39 +434,67 @@ def start_processing() -> bool:
                 st.rerun()
             return False
         elif response.status_code == 400:
-            error_detail = response.json().get("detail", "Bad request")
+            error_detail = _json(response).get("detail", "Bad request")
             st.error(f"❌ Processing error: {error_detail}")
             if "documents" in error_detail.lower():
                 st.info("💡 **Tip:** Make sure you have uploaded at least one document before starting processing.")
             return False
         else:
             try:
-                error_data = response.json()
+                error_data = _json(response)
                 error_msg = error_data.get("detail", "Unknown error")
                 # Log the full error for debugging
-                st.error(f"❌ Failed to start processing: {error_msg}")
-                st.error(f"🔍 Debug info: HTTP {response.status_code}, Application ID: {st.session_state.application_id}")
+                st.error(
+                    f"❌ Failed to start processing: {error_msg}\n\n"
+                    f"🔍 Debug info: HTTP {response.status_code}, Application ID: {st.session_state.application_id}"
+                )
             except Exception as parse_error:
-                st.error(f"❌ Failed to start processing (HTTP {response.status_code})")
-                st.error(f"🔍 Response: {response.text}")
-                st.error(f"🔍 Parse error: {str(parse_error)}")
+                st.error(
+                    f"❌ Failed to start processing (HTTP {response.status_code})\n\n"
+                    f"🔍 Response: {response.text}\n\n"
+                    f"🔍 Parse error: {str(parse_error)}"
+                )
             return False
 
     except Exception as e:
         st.error(f"Error starting processing: {str(e)}")
         return False
 
-def get_processing_status() -> Dict[str, Any]:
-    """Get current processing status"""
+@st.cache_resource
+def _inflight_requests() -> Tuple[threading.Lock, Dict[tuple, Future]]:
+    """Process-wide registry of in-flight backend GETs, shared by all sessions"""
+    return threading.Lock(), {}
+
+def _singleflight(key: tuple, fetch: Callable[[], Any]) -> Any:
+    """Run fetch once per key; concurrent callers with the same key share its result"""
+    lock, inflight = _inflight_requests()
+    with lock:
+        future = inflight.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = inflight[key] = Future()
+
+    if is_leader:
+        try:
+            future.set_result(fetch())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with lock:
+                inflight.pop(key, None)
+
+    return future.result()
+
+def _fetch_processing_status(application_id: int, headers: Dict[str, str]) -> Dict[str, Any]:
+    """Fetch processing status"""
     try:
-        headers = get_auth_headers()
-        response = requests.get(
-            f"{API_BASE_URL}/applications/{st.session_state.application_id}/status",
+        response = _request(
+            API_BASE_URL, "GET", f"/applications/{application_id}/status",
             headers=headers
         )
 
         if response.status_code == 200:
-            return response.json()
+            return _json(response)
         elif response.status_code == 404:
             return {"status": "not_found", "error": "Application not found"}
         else:
@@ -205,24 +503,200 @@ def get_processing_status() -> Dict[str, Any]:
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
-def get_application_details() -> Dict[str, Any]:
+def _poll_status(application_id: int, authorization: Optional[str]) -> Dict[str, Any]:
+    """Plain status GET; identical concurrent polls share one request"""
+    headers = {"Authorization": authorization} if authorization else {}
+    return _singleflight(
+        ("status", application_id, authorization),
+        lambda: _fetch_processing_status(application_id, headers)
+    )
+
+@st.cache_data(ttl=1, max_entries=128, show_spinner=False)
+def _cached_live_status(application_id: int, authorization: Optional[str]) -> Dict[str, Any]:
+    """Status of an application that may still change"""
+    return _poll_status(application_id, authorization)
+
+@st.cache_data(ttl=30, max_entries=128, show_spinner=False)
+def _cached_final_status(application_id: int, authorization: Optional[str]) -> Dict[str, Any]:
+    """Status of an application last seen completed or failed"""
+    return _poll_status(application_id, authorization)
+
+def _current_status(application_id: int, authorization: Optional[str], last_status: Optional[str]) -> Dict[str, Any]:
+    """Cached status: 1s while it may change, 30s once it was terminal"""
+    cached = _cached_final_status if last_status in TERMINAL_STATUSES else _cached_live_status
+    return cached(application_id, authorization)
+
+def clear_status_cache():
+    """Drop cached statuses after an action that changes them"""
+    _cached_live_status.clear()
+    _cached_final_status.clear()
+
+def _details_key(status: Dict[str, Any]) -> Any:
+    """What cached details are keyed on: the status version, or (status, progress)
+    from backends whose status endpoint doesn't report a version"""
+    return status.get("version") or (status.get("status"), status.get("progress"))
+
+def _remember_status(status: Dict[str, Any]):
+    st.session_state.last_status = status.get("status")
+    st.session_state.details_key = _details_key(status)
+
+def get_processing_status() -> Dict[str, Any]:
+    """Get current processing status"""
+    application_id = st.session_state.application_id
+    authorization = get_auth_headers().get("Authorization")
+    status = _current_status(application_id, authorization, st.session_state.last_status)
+
+    _remember_status(status)
+    return status
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_application_details(application_id: int, auth_token: Optional[str], details_key: Any) -> Dict[str, Any]:
+    """Fetch application details, re-fetched only when the status moves on"""
+    headers = {"Authorization": f"Bearer {auth_token}"} if auth_token else {}
+    response = _request(
+        API_BASE_URL, "GET", f"/applications/{application_id}/details",
+        headers=headers
+    )
+    response.raise_for_status()
+    return _json(response)
+
+def _application_details_or_error(application_id: int, auth_token: Optional[str], details_key: Any) -> Dict[str, Any]:
+    """Cached application details, or an {"error": ...} dict (safe to call off the script thread)"""
+    try:
+        return _fetch_application_details(application_id, auth_token, details_key)
+
+    except requests.exceptions.HTTPError as e:
+        if e.response.status_code == 404:
+            return {"error": "Application not found"}
+        return {"error": e.response.text}
+    except Exception as e:
+        return {"error": str(e)}
+
+def get_application_details(details_key: Any = None) -> Dict[str, Any]:
     """Get detailed application information"""
+    return _application_details_or_error(
+        st.session_state.application_id,
+        st.session_state.user_token,
+        details_key
+    )
+
+def start_results_fetch() -> Tuple[Any, ...]:
+    """Submit the Results tab's status and details fetches to the background pool"""
+    application_id = st.session_state.application_id
+    auth_token = st.session_state.user_token
+    authorization = get_auth_headers().get("Authorization")
+    known_key = st.session_state.details_key
+
+    status_future = _submit(_current_status, application_id, authorization, st.session_state.last_status)
+    details_future = _submit(_application_details_or_error, application_id, auth_token, known_key)
+    return application_id, auth_token, known_key, status_future, details_future
+
+def fetch_results(pending: Optional[Tuple[Any, ...]] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Fetch processing status and application details for the Results tab concurrently
+
+    `pending` is a fetch already started by start_results_fetch(); it is only
+    used if it was started for the current application.
+    """
+    if pending is None or pending[0] != st.session_state.application_id:
+        pending = start_results_fetch()
+    application_id, auth_token, known_key, status_future, details_future = pending
+
+    status = status_future.result()
+    details = details_future.result()
+
+    _remember_status(status)
+    key = st.session_state.details_key
+    if key != known_key:
+        # The status moved on while both were in flight; refetch details for the new one
+        details = _application_details_or_error(application_id, auth_token, key)
+
+    return status, details
+
+@st.cache_resource
+def _background_executor() -> ThreadPoolExecutor:
+    """Shared worker pool for independent backend calls"""
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="api")
+
+def _submit(fn: Callable[..., Any], *args: Any) -> Future:
+    """Run fn on the background pool with this script run's context attached,
+    so the Streamlit caches it calls behave as they do on the script thread"""
+    ctx = get_script_run_ctx()
+
+    def run() -> Any:
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args)
+
+    return _background_executor().submit(run)
+
+def _fetch_stats() -> Tuple[str, Dict[str, Any]]:
+    """Fetch system statistics for the sidebar as (state, payload)"""
     try:
-        headers = get_auth_headers()
-        response = requests.get(
-            f"{API_BASE_URL}/applications/{st.session_state.application_id}/details",
-            headers=headers
+        response = _request(API_BASE_URL, "GET", "/analytics/stats", timeout=5)
+        if response.status_code == 200:
+            return "ok", _json(response)
+        return "api_error", {}
+    except requests.exceptions.ConnectionError:
+        return "offline", {}
+    except requests.exceptions.Timeout:
+        return "timeout", {}
+    except Exception:
+        return "unavailable", {}
+
+def _fetch_chat_health() -> Tuple[str, Dict[str, Any]]:
+    """Fetch chat service health for the sidebar as (state, payload)"""
+    try:
+        response = _request(CHAT_API_URL, "GET", "/chat/health", timeout=3)
+        if response.status_code == 200:
+            return "ok", _json(response)
+        return "offline", {}
+    except Exception:
+        return "offline", {}
+
+@st.cache_data(ttl=15, show_spinner=False)
+def fetch_sidebar_status() -> Dict[str, Tuple[str, Dict[str, Any]]]:
+    """Probe backend stats and chat health concurrently"""
+    stats_future = _submit(_fetch_stats)
+    chat_future = _submit(_fetch_chat_health)
+    return {"stats": stats_future.result(), "chat": chat_future.result()}
+
+def fetch_chat_response(user_message: str, application_id: Optional[int],
+                        recent_turns: List[Dict[str, str]]) -> str:
+    """Ask the chat service for a reply"""
+    try:
+        # One JSON payload carries the message plus the recent conversation
+        chat_response = _request(
+            CHAT_API_URL, "POST", "/chat/message",
+            json={
+                "message": user_message,
+                "application_id": application_id,
+                "recent_turns": recent_turns
+            },
+            timeout=8
         )
 
-        if response.status_code == 200:
-            return response.json()
-        elif response.status_code == 404:
-            return {"error": "Application not found"}
+        if chat_response.status_code == 200:
+            result = _json(chat_response)
+            response = result.get("response", "I'm here to help! Could you please rephrase your question?")
+
+            # Add indicators for LLM vs fallback
+            if result.get("fallback"):
+                response += "\n\n🔧 *Using basic responses - LLM temporarily unavailable*"
         else:
-            return {"error": response.text}
+            # Fallback to simple response if API fails
+            response = "I'm here to help with your social support application. The AI service is temporarily unavailable, but I can still assist with basic information. What would you like to know?"
+
+    except requests.exceptions.Timeout:
+        response = "⏱️ The AI is thinking... This might take a moment for complex questions. You can try asking a simpler question or wait and try again."
+    except requests.exceptions.ConnectionError:
+        response = "🔴 **Connection Error**: The AI chat service is currently offline. I can still help with basic information:\n\n📄 **Documents needed**: Emirates ID, bank statements, income proof\n✅ **Basic eligibility**: UAE residency, income below AED 4,000\n⚙️ **Process**: Submit form → Upload documents → AI processing → Decision"
+    except Exception:
+        # Fallback response for other errors
+        response = next(
+            (reply for pattern, reply in FALLBACK_RESPONSES if pattern.search(user_message)),
+            DEFAULT_FALLBACK_RESPONSE
+        )
 
-    except Exception as e:
-        return {"error": str(e)}
+    return response
 
 def load_application_form_data():
     """Load and restore application form data from backend"""
@@ -239,44 +713,29 @@ def load_application_form_data():
             applicant_info = details.get("applicant", {})
             application_info = details.get("application", {})
 
-            # Parse applicant_data - handle both authenticated (JSON string) and anonymous (dict) formats
-            applicant_data = {}
-            if application_info.get("applicant_data"):
-                if isinstance(application_info["applicant_data"], str):
-                    # Authenticated user - data stored as JSON string
-                    try:
-                        import json
-                        applicant_data = json.loads(application_info["applicant_data"])
-                    except:
-                        applicant_data = {}
-                elif isinstance(application_info["applicant_data"], dict):
-                    # Anonymous user - data stored as dict
-                    applicant_data = application_info["applicant_data"]
-
-            # Also check if the backend response has a different structure
-            # For anonymous users, check the main response structure
-            if not applicant_data and "applicant_data" in details:
-                raw_data = details["applicant_data"]
-                if isinstance(raw_data, dict):
-                    applicant_data = raw_data
+            # The backend returns applicant_data already parsed to a dict
+            # for both authenticated and anonymous applications
+            applicant_data = application_info.get("applicant_data") or {}
+
+            # Split the display name once as a fallback for first/last name
+            name_parts = (applicant_info.get("name") or "").split(" ", 1)
+            fallback_first_name = name_parts[0]
+            fallback_last_name = name_parts[1] if len(name_parts) > 1 else ""
+
+            # Fields missing from applicant_data fall back to the summary
+            # blocks of the response, then to the form defaults
+            fallbacks = {
+                **_FORM_FIELD_DEFAULTS,
+                "first_name": fallback_first_name,
+                "last_name": fallback_last_name,
+                "emirates_id": applicant_info.get("emirates_id", ""),
+                "email": applicant_info.get("email", ""),
+                "phone": applicant_info.get("phone", ""),
+                "application_type": application_info.get("type", "financial_support"),
+            }
 
             # Restore form data to session state from backend
-            restored_data = {
-                "first_name": applicant_data.get("first_name", applicant_info.get("name", "").split(" ")[0] if applicant_info.get("name") else ""),
-                "last_name": applicant_data.get("last_name", " ".join(applicant_info.get("name", "").split(" ")[1:]) if applicant_info.get("name") else ""),
-                "emirates_id": applicant_data.get("emirates_id", applicant_info.get("emirates_id", "")),
-                "email": applicant_data.get("email", applicant_info.get("email", "")),
-                "phone": applicant_data.get("phone", applicant_info.get("phone", "")),
-                "date_of_birth": applicant_data.get("date_of_birth", ""),
-                "address": applicant_data.get("address", ""),
-                "family_size": applicant_data.get("family_size", 1),
-                "urgency_level": applicant_data.get("urgency_level", "normal"),
-                "application_type": applicant_data.get("application_type", application_info.get("type", "financial_support")),
-                "monthly_income": applicant_data.get("monthly_income", 0),
-                "employment_status": applicant_data.get("employment_status", "employed"),
-                "bank_balance": applicant_data.get("bank_balance", 0),
-                "has_existing_support": applicant_data.get("has_existing_support", False)
-            }
+            restored_data = {field: applicant_data.get(field, default) for field, default in fallbacks.items()}
 
             # Update session state with backend data
             st.session_state.form_data = restored_data
@@ -308,94 +767,312 @@ def load_application_form_data():
 
 # Main application UI
 
-def main():
-    # Check authentication first
-    if not check_authentication():
-        return  # Authentication page is shown, exit main
+def application_status_panel(auto_refresh: bool = False):
+    """Sidebar status block; run as a fragment that re-polls on a timer while processing"""
+    st.header("📊 Application Status")
 
-    # Ensure session is saved to URL for persistence
-    if st.session_state.logged_in and st.session_state.logged_in != "anonymous":
-        save_session_to_url()
+    if st.session_state.application_id:
+        st.info(f"Application ID: {st.session_state.application_id}")
 
-    st.title("🤝 AI Social Support Application System")
-    st.markdown("**Automated Processing for Financial Support and Economic Enablement**")
+        # Get current status
+        status = get_processing_status()
+        current_status = status.get("status", "unknown")
 
-    # Sidebar for navigation and status
-    with st.sidebar:
-        st.header("📊 Application Status")
+        if auto_refresh != (current_status == "processing"):
+            # Processing started or finished: rerun the page so the timer is set or dropped
+            st.rerun()
+
+        if current_status == "processing":
+            st.warning("🔄 Processing in progress...")
+            progress = status.get("progress", 0)
+            st.progress(progress / 100)
+            st.text(f"Stage: {status.get('current_stage', 'Unknown')}")
+
+        elif current_status == "completed":
+            st.success("✅ Processing completed!")
+
+        elif current_status == "failed":
+            st.error("❌ Processing failed")
+
+        elif current_status == "not_found":
+            st.error("❌ Application not found")
+            st.warning("Please submit a new application")
+            if st.button("🔄 Reset & Start Over"):
+                st.session_state.application_submitted = False
+                st.session_state.application_id = None
+                st.session_state.documents_uploaded = False
+                st.session_state.processing_started = False
+                st.rerun()
+
+        # Refresh button
+        if st.button("🔄 Refresh Status"):
+            fetch_sidebar_status.clear()
+            clear_status_cache()
+            st.rerun()
+
+    else:
+        st.info("No application submitted yet")
+
+@st.fragment
+def chat_panel():
+    """Chat tab; sending a message reruns only this fragment"""
+    st.header("💬 Interactive Application Assistant")
+
+    # Chat interface (filled in after the input is read, so a new
+    # message shows up in this same run)
+    chat_container = st.container()
+
+    # Chat input
+    user_input = st.chat_input("Ask me anything about your application...")
+
+    if user_input:
+        recent_turns = [
+            {"role": message["role"], "content": message["content"]}
+            for message in _recent_chat_messages(CHAT_CONTEXT_TURNS)
+        ]
+        add_chat_message("user", user_input)
+
+    with chat_container:
+        display_chat_messages()
 
-        if st.session_state.application_id:
-            st.info(f"Application ID: {st.session_state.application_id}")
+        if user_input:
+            # Draw the thinking indicator under the new message, then swap in the reply
+            chat_placeholder = st.empty()
+            with chat_placeholder.container():
+                _render_chat_message({
+                    "role": "assistant",
+                    "content": THINKING_MESSAGE,
+                    "timestamp": time.strftime("%H:%M:%S")
+                })
+
+            response = fetch_chat_response(user_input, st.session_state.application_id, recent_turns)
+            add_chat_message("assistant", response)
+            with chat_placeholder.container():
+                _render_chat_message(st.session_state.chat_messages[-1])
+
+def results_panel(auto_refresh: bool = False):
+    """Results tab; run as a fragment that re-polls on a timer while processing"""
+    st.header("📊 Application Results")
+
+    # Debug info for troubleshooting
+    if st.session_state.application_id:
+        st.info(f"🔍 **Application ID**: {st.session_state.application_id}")
+
+        # Status and details are independent GETs, so they are fetched together;
+        # details stay cached until the status moves on. A full run starts
+        # them before the other tabs render; timer reruns fetch here.
+        with st.spinner("Loading results..."):
+            status, details = fetch_results(st.session_state.pop("results_prefetch", None))
+        current_status = status.get("status", "unknown")
+
+        if auto_refresh and current_status != "processing":
+            # Processing finished: rerun the whole page so the timer stops and the rest catches up
+            st.rerun()
 
-            # Get current status
-            status = get_processing_status()
-            current_status = status.get("status", "unknown")
+        if current_status != "unknown" and current_status != "error":
+            # Show processing status
+            st.subheader("📊 Processing Status")
 
-            if current_status == "processing":
-                st.warning("🔄 Processing in progress...")
+            if current_status == "initialized":
+                st.info("🔄 **Status**: Initialized - Ready for processing")
+            elif current_status == "processing":
+                st.warning("⏳ **Status**: Processing in progress...")
                 progress = status.get("progress", 0)
                 st.progress(progress / 100)
-                st.text(f"Stage: {status.get('current_stage', 'Unknown')}")
-
+                if status.get("current_stage"):
+                    st.text(f"Current Stage: {status.get('current_stage')}")
             elif current_status == "completed":
-                st.success("✅ Processing completed!")
-
+                st.success("✅ **Status**: Processing completed!")
             elif current_status == "failed":
-                st.error("❌ Processing failed")
-
-            elif current_status == "not_found":
-                st.error("❌ Application not found")
-                st.warning("Please submit a new application")
-                if st.button("🔄 Reset & Start Over"):
-                    st.session_state.application_submitted = False
-                    st.session_state.application_id = None
-                    st.session_state.documents_uploaded = False
-                    st.session_state.processing_started = False
-                    st.rerun()
+                st.error("❌ **Status**: Processing failed")
+            else:
+                st.warning(f"⚠️ **Status**: {current_status}")
+
+            st.divider()
+
+        if "error" not in details:
+            # Display application summary
+            app_info = details.get("application", {})
+            applicant_info = details.get("applicant", {})
+
+            col1, col2 = st.columns(2)
+
+            with col1:
+                st.subheader("👤 Applicant Information")
+                if applicant_info:
+                    st.text(
+                        f"Name: {applicant_info.get('name', 'N/A')}\n"
+                        f"Emirates ID: {applicant_info.get('emirates_id', 'N/A')}\n"
+                        f"Email: {applicant_info.get('email', 'N/A')}\n"
+                        f"Phone: {applicant_info.get('phone', 'N/A')}"
+                    )
+
+            with col2:
+                st.subheader("📋 Application Status")
+                st.text(
+                    f"Type: {app_info.get('type', 'N/A').replace('_', ' ').title()}\n"
+                    f"Status: {app_info.get('status', 'N/A').title()}\n"
+                    f"Submitted: {app_info.get('submitted_at', 'N/A')[:19] if app_info.get('submitted_at') else 'N/A'}"
+                )
+
+            # Display documents
+            documents = details.get("documents", [])
+            if documents:
+                st.subheader("📄 Uploaded Documents")
+                rows = [{k: doc.get(k) for k in DOCUMENT_TABLE_COLUMNS} for doc in documents]
+                st.dataframe(rows, use_container_width=True)
+
+            # Display processing results if available
+            processing_status = details.get("processing_status", {})
+            if processing_status.get("status") == "completed":
+                st.subheader("🎯 Processing Results")
+
+                result_data = processing_status.get("result", {})
+                if result_data:
+                    # Display agent responses
+                    agent_responses = result_data.get("agent_responses", [])
+                    if agent_responses:
+                        st.success("✅ **Processing Complete**")
+                        for i, response in enumerate(agent_responses):
+                            agent_name = response.get('agent', f'Agent {i+1}').replace('_', ' ').title()
+                            with st.expander(f"🤖 {agent_name}: {response.get('message', 'No message')[:50]}..."):
+                                col1, col2 = st.columns([1, 3])
+                                with col1:
+                                    if response.get('success'):
+                                        st.success("✅ Success")
+                                    else:
+                                        st.error("❌ Failed")
+                                with col2:
+                                    st.write(response.get('message', 'No message available'))
+
+                    # Display final decision
+                    if result_data.get('decision'):
+                        decision = result_data['decision']
+                        if decision.lower() == 'approved':
+                            st.success(f"🎉 **Application Approved**")
+                            if result_data.get('support_amount'):
+                                st.info(f"💰 **Monthly Support**: AED {result_data['support_amount']:,}")
+                        elif decision.lower() == 'declined':
+                            st.error("❌ **Application Declined**")
+                        else:
+                            st.warning("⏳ **Under Review**")
+
+                        if result_data.get('message'):
+                            st.write(result_data['message'])
 
-            # Refresh button
-            if st.button("🔄 Refresh Status"):
+            # Real-time status updates
+            if st.button("🔄 Refresh Results"):
+                _fetch_application_details.clear()
+                clear_status_cache()
                 st.rerun()
 
         else:
-            st.info("No application submitted yet")
+            st.error(f"❌ Error loading application details: {details.get('error')}")
+
+            # Show basic info from session state if available
+            if st.session_state.form_data:
+                st.warning("📋 **Showing basic information from your session:**")
+                with st.expander("Application Information", expanded=True):
+                    data = st.session_state.form_data
+                    col1, col2 = st.columns(2)
+
+                    with col1:
+                        lines = ["**Personal Information:**"]
+                        if data.get("first_name") or data.get("last_name"):
+                            lines.append(f"• Name: {data.get('first_name', '')} {data.get('last_name', '')}")
+                        if data.get("emirates_id"):
+                            lines.append(f"• Emirates ID: {data.get('emirates_id')}")
+                        st.markdown("\n\n".join(lines))
+
+                    with col2:
+                        lines = ["**Application Details:**"]
+                        if data.get("application_type"):
+                            lines.append(f"• Type: {APPLICATION_TYPE_LABELS.get(data['application_type'], data['application_type'])}")
+                        if data.get("urgency_level"):
+                            lines.append(f"• Urgency: {data.get('urgency_level').title()}")
+                        st.markdown("\n\n".join(lines))
+
+            # Show instructions for troubleshooting
+            st.info("💡 **Troubleshooting:**")
+            st.write("1. Make sure you have submitted an application")
+            st.write("2. Upload documents in the Documents tab")
+            st.write("3. Start processing to see results")
+
+    else:
+        st.info("📋 **No application found.** Please submit an application first.")
+
+        # Show helpful next steps
+        st.markdown("""
+        ### 🚀 **How to see results:**
+        1. **📋 Go to Application Form** - Submit your application
+        2. **📄 Go to Documents** - Upload required documents
+        3. **🚀 Start Processing** - Begin application review
+        4. **📊 Return here** - View your results
+
+        ### 📈 **What you'll see here:**
+        - ✅ Application processing status
+        - 📊 Progress indicators
+        - 🎯 Final decision (Approved/Declined)
+        - 💰 Support amount (if approved)
+        - 🤖 Detailed agent analysis
+        """)
+
+def main():
+    st.markdown(f"<style>{load_custom_css()}</style>", unsafe_allow_html=True)
+
+    # Check authentication first
+    if not check_authentication():
+        return  # Authentication page is shown, exit main
+
+    # Sync the token and application ID to the URL once per run. Handlers that
+    # change them rerun straight away, so the write lands here on the next run.
+    save_session_to_url()
+
+    st.title("🤝 AI Social Support Application System")
+    st.markdown("**Automated Processing for Financial Support and Economic Enablement**")
+
+    # Sidebar for navigation and status
+    with st.sidebar:
+        # Poll on a timer only while processing; otherwise the panel redraws with the page
+        processing = st.session_state.last_status == "processing"
+        st.fragment(application_status_panel, run_every=STATUS_REFRESH_SECONDS if processing else None)(processing)
 
         st.divider()
 
+        sidebar_status = fetch_sidebar_status()
+
         # System stats
         st.subheader("📈 System Statistics")
-        try:
-            response = requests.get(f"{API_BASE_URL}/analytics/stats", timeout=5)
-            if response.status_code == 200:
-                stats = response.json()
-                st.metric("Total Applications", stats.get("total_applications", 0))
-                st.metric("System Health", stats.get("system_health", "Unknown"))
-            else:
-                st.text("API Error")
-        except requests.exceptions.ConnectionError:
+        stats_state, stats = sidebar_status["stats"]
+        if stats_state == "ok":
+            st.metric("Total Applications", stats.get("total_applications", 0))
+            st.metric("System Health", stats.get("system_health", "Unknown"))
+        elif stats_state == "api_error":
+            st.text("API Error")
+        elif stats_state == "offline":
             st.error("🔴 Backend server offline")
-        except requests.exceptions.Timeout:
+        elif stats_state == "timeout":
             st.warning("⏱️ Backend server slow")
-        except Exception:
+        else:
             st.text("Stats unavailable")
 
         # LLM Chat Status
         st.subheader("🤖 AI Chat Status")
-        try:
-            response = requests.get(f"{CHAT_API_URL}/chat/health", timeout=3)
-            if response.status_code == 200:
-                chat_health = response.json()
-                if chat_health.get("llm_available"):
-                    st.success("🟢 LLM Active")
-                    st.caption(f"Model: {chat_health.get('model', 'Unknown')}")
-                else:
-                    st.warning("🟡 Fallback Mode")
-                    st.caption("Using rule-based responses")
+        chat_state, chat_health = sidebar_status["chat"]
+        if chat_state == "ok":
+            if chat_health.get("llm_available"):
+                st.success("🟢 LLM Active")
+                st.caption(f"Model: {chat_health.get('model', 'Unknown')}")
             else:
-                st.error("🔴 Chat service offline")
-        except:
+                st.warning("🟡 Fallback Mode")
+                st.caption("Using rule-based responses")
+        else:
             st.error("🔴 Chat service offline")
 
+    # Start the Results tab's fetches now so they overlap with rendering the other tabs
+    if st.session_state.application_id:
+        st.session_state.results_prefetch = start_results_fetch()
+
     # Main content area with tabs
     # Core application tabs (as per README specifications)
     tab1, tab2, tab3, tab4 = st.tabs(["💬 Application Chat", "📋 Application Form", "📄 Documents", "📊 Results"])
@@ -404,77 +1081,7 @@ def main():
     # They can be re-enabled when full multi-user authentication system is deployed
 
     with tab1:
-        st.header("💬 Interactive Application Assistant")
-
-        # Chat interface
-        chat_container = st.container()
-
-        with chat_container:
-            display_chat_messages()
-
-        # Chat input
-        user_input = st.chat_input("Ask me anything about your application...")
-
-        if user_input:
-            # Immediately show user message and loading indicator
-            add_chat_message("user", user_input)
-            add_chat_message("assistant", "🤖 *AI is thinking...*")
-
-            # Force display of messages
-            st.rerun()
-
-        # Check if we need to replace the loading message with actual response
-        if (len(st.session_state.chat_messages) > 0 and
-            st.session_state.chat_messages[-1]["role"] == "assistant" and
-            st.session_state.chat_messages[-1]["content"] == "🤖 *AI is thinking...*"):
-
-            # Get the user's last message
-            user_message = st.session_state.chat_messages[-2]["content"]
-
-            # Remove the loading message
-            st.session_state.chat_messages.pop()
-
-            # Get AI-powered response from backend
-            try:
-                # Create query string for the chat API
-                import urllib.parse
-                query_params = f"message={urllib.parse.quote(user_message)}"
-                if st.session_state.application_id:
-                    query_params += f"&application_id={st.session_state.application_id}"
-
-                chat_response = requests.post(
-                    f"{CHAT_API_URL}/chat/message?{query_params}",
-                    timeout=8
-                )
-
-                if chat_response.status_code == 200:
-                    result = chat_response.json()
-                    response = result.get("response", "I'm here to help! Could you please rephrase your question?")
-
-                    # Add indicators for LLM vs fallback
-                    if result.get("fallback"):
-                        response += "\n\n🔧 *Using basic responses - LLM temporarily unavailable*"
-                else:
-                    # Fallback to simple response if API fails
-                    response = "I'm here to help with your social support application. The AI service is temporarily unavailable, but I can still assist with basic information. What would you like to know?"
-
-            except requests.exceptions.Timeout:
-                response = "⏱️ The AI is thinking... This might take a moment for complex questions. You can try asking a simpler question or wait and try again."
-            except requests.exceptions.ConnectionError:
-                response = "🔴 **Connection Error**: The AI chat service is currently offline. I can still help with basic information:\n\n📄 **Documents needed**: Emirates ID, bank statements, income proof\n✅ **Basic eligibility**: UAE residency, income below AED 4,000\n⚙️ **Process**: Submit form → Upload documents → AI processing → Decision"
-            except Exception as e:
-                # Fallback response for other errors
-                if "document" in user_message.lower():
-                    response = "📄 I can help with documents! You'll need Emirates ID, bank statements, and income proof. Please try again when the AI service is available for more detailed assistance."
-                elif "eligibility" in user_message.lower():
-                    response = "✅ Basic eligibility includes UAE residency and monthly income below AED 4,000. Please try again when the AI service is available for detailed criteria."
-                elif any(word in user_message.lower() for word in ["hello", "hi", "hey"]):
-                    response = "👋 Hello! I'm your AI Social Support Assistant. The AI service is temporarily slow, but I'm here to help with basic questions."
-                else:
-                    response = "I'm here to help! The AI service is temporarily unavailable, but I can provide basic information about documents, eligibility, or the application process."
-
-            add_chat_message("assistant", response)
-            st.rerun()
+        chat_panel()
 
     with tab2:
         st.header("📋 Application Form")
@@ -557,12 +1164,11 @@ def main():
                         value=dob_value
                     )
 
-                    urgency_options = ["normal", "high", "critical"]
-                    urgency_index = 0
-                    if saved_data.get("urgency_level") in urgency_options:
-                        urgency_index = urgency_options.index(saved_data["urgency_level"])
-
-                    urgency_level = st.selectbox("Urgency Level *", urgency_options, index=urgency_index)
+                    urgency_level = st.selectbox(
+                        "Urgency Level *",
+                        URGENCY_OPTIONS,
+                        index=_URGENCY_INDEX.get(saved_data.get("urgency_level"), 0)
+                    )
 
                 address = st.text_area("Address (Optional)",
                     value=saved_data.get("address", ""),
@@ -570,16 +1176,11 @@ def main():
 
                 st.subheader("Application Details")
 
-                app_type_options = ["financial_support", "economic_enablement"]
-                app_type_index = 0
-                if saved_data.get("application_type") in app_type_options:
-                    app_type_index = app_type_options.index(saved_data["application_type"])
-
                 application_type = st.selectbox(
                     "Application Type *",
-                    app_type_options,
-                    index=app_type_index,
-                    format_func=lambda x: "Financial Support" if x == "financial_support" else "Economic Enablement"
+                    APPLICATION_TYPE_OPTIONS,
+                    index=_APPLICATION_TYPE_INDEX.get(saved_data.get("application_type"), 0),
+                    format_func=APPLICATION_TYPE_LABELS.get
                 )
 
                 # Additional financial information
@@ -591,12 +1192,11 @@ def main():
                         min_value=0,
                         value=saved_data.get("monthly_income", 0))
 
-                    emp_options = ["employed", "unemployed", "self_employed", "student", "retired"]
-                    emp_index = 0
-                    if saved_data.get("employment_status") in emp_options:
-                        emp_index = emp_options.index(saved_data["employment_status"])
-
-                    employment_status = st.selectbox("Employment Status (Optional)", emp_options, index=emp_index)
+                    employment_status = st.selectbox(
+                        "Employment Status (Optional)",
+                        EMPLOYMENT_OPTIONS,
+                        index=_EMPLOYMENT_INDEX.get(saved_data.get("employment_status"), 0)
+                    )
 
                 with col4:
                     bank_balance = st.number_input("Current Bank Balance (AED) - Optional",
@@ -630,76 +1230,22 @@ def main():
                     st.session_state.form_data = form_data
 
                     # Enhanced validation with detailed checks
-                    errors = []
-                    warnings = []
-
-                    # Required field validation
-                    if not first_name or not first_name.strip():
-                        errors.append("First name is required")
-                    elif len(first_name.strip()) < 2:
-                        errors.append("First name must be at least 2 characters")
-
-                    if not last_name or not last_name.strip():
-                        errors.append("Last name is required")
-                    elif len(last_name.strip()) < 2:
-                        errors.append("Last name must be at least 2 characters")
-
-                    if not emirates_id or not emirates_id.strip():
-                        errors.append("Emirates ID is required")
-                    else:
-                        # Emirates ID format validation (784-XXXX-XXXXXXX-X)
-                        clean_emirates_id = emirates_id.replace("-", "").replace(" ", "")
-                        if not clean_emirates_id.startswith("784"):
-                            errors.append("Emirates ID must start with 784")
-                        elif len(clean_emirates_id) != 15:
-                            errors.append("Emirates ID must be exactly 15 digits (784-XXXX-XXXXXXX-X)")
-                        elif not clean_emirates_id.isdigit():
-                            errors.append("Emirates ID must contain only digits and dashes")
-
-                    # Email validation (enhanced)
-                    if email:
-                        email = email.strip()
-                        if "@" not in email:
-                            errors.append("Email must contain @ symbol")
-                        elif "." not in email.split("@")[-1]:
-                            errors.append("Email domain must contain a period (e.g. .com)")
-                        elif len(email.split("@")[0]) < 1:
-                            errors.append("Email must have a username before @")
-                    else:
-                        warnings.append("Email is optional but recommended for updates")
-
-                    # Phone validation (enhanced)
-                    if phone:
-                        clean_phone = phone.replace("+", "").replace(" ", "").replace("-", "").replace("(", "").replace(")", "")
-                        if not clean_phone.isdigit():
-                            errors.append("Phone number must contain only digits")
-                        elif len(clean_phone) < 10:
-                            errors.append("Phone number must be at least 10 digits")
-                        elif not (clean_phone.startswith("971") or clean_phone.startswith("0")):
-                            warnings.append("UAE phone numbers typically start with +971 or 0")
-
-                    # Address validation
-                    if address and len(address.strip()) < 10:
-                        warnings.append("Address seems short - please provide full address for verification")
-
-                    # Age validation from date of birth
-                    if date_of_birth:
-                        from datetime import date
-                        today = date.today()
-                        age = today.year - date_of_birth.year - ((today.month, today.day) < (date_of_birth.month, date_of_birth.day))
-                        if age < 18:
-                            errors.append("Applicant must be at least 18 years old")
-                        elif age > 100:
-                            errors.append("Please check date of birth - age seems invalid")
-                    else:
-                        warnings.append("Date of birth is recommended for age verification")
-
-                    # Income and eligibility checks
-                    if monthly_income > 4000:
-                        warnings.append("Monthly income above AED 4,000 may affect eligibility")
+                    # Field format rules (required, patterns) run from one table
+                    email = email.strip()
+                    errors, warnings = validate_form_fields({
+                        "first_name": first_name,
+                        "last_name": last_name,
+                        "emirates_id": emirates_id,
+                        "email": email,
+                        "phone": phone,
+                    })
 
-                    if has_existing_support:
-                        warnings.append("Existing government support may affect your application")
+                    # Address, age and eligibility checks
+                    detail_errors, detail_warnings = validate_applicant_details(
+                        address, date_of_birth, monthly_income, has_existing_support
+                    )
+                    errors.extend(detail_errors)
+                    warnings.extend(detail_warnings)
 
                     # Display validation errors and warnings
                     if errors:
@@ -745,8 +1291,6 @@ def main():
                                 st.session_state.form_edit_mode = False
                                 st.success("✅ Application updated successfully!")
                                 st.info("💡 Your changes have been saved. Note: You may need to re-upload documents if there were significant changes.")
-                                # Save session context to URL for persistence
-                                save_session_to_url()
                                 st.rerun()
                             else:
                                 st.error("❌ Failed to update application in backend. Please try again.")
@@ -754,8 +1298,6 @@ def main():
                             # Handle new application submission
                             if submit_application(applicant_data):
                                 st.session_state.application_submitted = True
-                                # Save application context to URL for persistence (both authenticated and anonymous)
-                                save_session_to_url()
                                 st.success("✅ Application submitted successfully!")
                                 st.rerun()
 
@@ -769,29 +1311,31 @@ def main():
                 with st.expander("📋 View Application Details", expanded=False):
                     col1, col2 = st.columns(2)
 
+                    # One markdown element per column rather than one per line
+                    data = st.session_state.form_data
                     with col1:
-                        st.write("**Personal Information:**")
-                        data = st.session_state.form_data
+                        lines = ["**Personal Information:**"]
                         if data.get("first_name") or data.get("last_name"):
-                            st.write(f"• Name: {data.get('first_name', '')} {data.get('last_name', '')}")
+                            lines.append(f"• Name: {data.get('first_name', '')} {data.get('last_name', '')}")
                         if data.get("emirates_id"):
-                            st.write(f"• Emirates ID: {data.get('emirates_id')}")
+                            lines.append(f"• Emirates ID: {data.get('emirates_id')}")
                         if data.get("phone"):
-                            st.write(f"• Phone: {data.get('phone')}")
+                            lines.append(f"• Phone: {data.get('phone')}")
                         if data.get("email"):
-                            st.write(f"• Email: {data.get('email')}")
+                            lines.append(f"• Email: {data.get('email')}")
+                        st.markdown("\n\n".join(lines))
 
                     with col2:
-                        st.write("**Application Details:**")
+                        lines = ["**Application Details:**"]
                         if data.get("application_type"):
-                            app_type = "Financial Support" if data.get("application_type") == "financial_support" else "Economic Enablement"
-                            st.write(f"• Type: {app_type}")
+                            lines.append(f"• Type: {APPLICATION_TYPE_LABELS.get(data['application_type'], data['application_type'])}")
                         if data.get("urgency_level"):
-                            st.write(f"• Urgency: {data.get('urgency_level').title()}")
+                            lines.append(f"• Urgency: {data.get('urgency_level').title()}")
                         if data.get("family_size"):
-                            st.write(f"• Family Size: {data.get('family_size')}")
+                            lines.append(f"• Family Size: {data.get('family_size')}")
                         if data.get("employment_status"):
-                            st.write(f"• Employment: {data.get('employment_status').title()}")
+                            lines.append(f"• Employment: {data.get('employment_status').title()}")
+                        st.markdown("\n\n".join(lines))
 
             # Add some spacing and navigation hints
             st.divider()
@@ -865,20 +1409,19 @@ def main():
                         valid_files.append(file)
 
                 # Check total size of valid files
-                if valid_files:
-                    total_valid_size = sum(file.size for file in valid_files)
-                    if total_valid_size > max_total_size:
-                        st.error(f"❌ Total size of valid files ({total_valid_size/1024/1024:.1f}MB) exceeds 50MB limit")
-                        # Keep only files that fit within the limit
-                        cumulative_size = 0
-                        final_valid_files = []
-                        for file in valid_files:
-                            if cumulative_size + file.size <= max_total_size:
-                                final_valid_files.append(file)
-                                cumulative_size += file.size
-                            else:
-                                rejected_files.append(f"'{file.name}' - would exceed total size limit")
-                        valid_files = final_valid_files
+                # Running totals, computed once: the last one is the total size and
+                # the prefix cut below reuses them to trim an over-limit selection
+                running_sizes = list(accumulate(file.size for file in valid_files))
+                total_valid_size = running_sizes[-1] if running_sizes else 0
+                if total_valid_size > max_total_size:
+                    st.error(f"❌ Total size of valid files ({total_valid_size/1024/1024:.1f}MB) exceeds 50MB limit")
+                    # Keep the leading files whose running total fits within the limit
+                    fitting = bisect_right(running_sizes, max_total_size)
+                    rejected_files.extend(
+                        f"'{file.name}' - would exceed total size limit" for file in valid_files[fitting:]
+                    )
+                    valid_files = valid_files[:fitting]
+                    total_valid_size = running_sizes[fitting - 1] if fitting else 0
 
                 # Show rejected files
                 if rejected_files:
@@ -897,59 +1440,41 @@ def main():
                 with col1:
                     st.metric("📄 Files Selected", len(uploaded_files))
                 with col2:
-                    total_size_mb = sum(file.size for file in uploaded_files) / (1024 * 1024)
-                    st.metric("💾 Total Size", f"{total_size_mb:.1f} MB")
+                    st.metric("💾 Total Size", f"{total_valid_size / (1024 * 1024):.1f} MB")
                 with col3:
                     st.metric("📦 Status", "Ready to Classify")
 
                 st.divider()
 
-                document_types = []
-                for i, file in enumerate(uploaded_files):
-                    with st.container():
-                        col1, col2, col3 = st.columns([2, 2, 1])
-                        with col1:
-                            file_size_mb = file.size / (1024 * 1024)
-                            st.markdown(f"**📄 {file.name}**")
-                            st.caption(f"Size: {file_size_mb:.2f} MB | Type: {file.type}")
-                        with col2:
-                            doc_type = st.selectbox(
-                                "Document Type",
-                                ["emirates_id", "bank_statement", "credit_report", "resume", "assets_liabilities",
-                                 "salary_certificate", "trade_license", "passport", "visa", "utility_bill",
-                                 "rental_agreement", "family_book", "medical_report", "insurance_policy", "other"],
-                                key=f"doc_type_{i}",
-                                format_func=lambda x: {
-                                    "emirates_id": "🆔 Emirates ID",
-                                    "bank_statement": "🏦 Bank Statement",
-                                    "credit_report": "📊 Credit Report",
-                                    "resume": "📄 Resume/CV",
-                                    "assets_liabilities": "💰 Assets & Liabilities",
-                                    "salary_certificate": "💼 Salary Certificate",
-                                    "trade_license": "🏢 Trade License",
-                                    "passport": "📘 Passport",
-                                    "visa": "🛂 Visa",
-                                    "utility_bill": "⚡ Utility Bill",
-                                    "rental_agreement": "🏠 Rental Agreement",
-                                    "family_book": "👨‍👩‍👧‍👦 Family Book",
-                                    "medical_report": "🏥 Medical Report",
-                                    "insurance_policy": "🛡️ Insurance Policy",
-                                    "other": "📎 Other Document"
-                                }.get(x, x)
-                            )
-                            document_types.append(doc_type)
-                        with col3:
-                            if file_size_mb > 10:
-                                st.error("❌ Too large")
-                            else:
-                                st.success("✅ Valid")
-                    st.divider()
+                # One editable table instead of a selectbox per file. Unkeyed on purpose:
+                # its identity follows the rows, so choosing other files resets the edits.
+                classified = st.data_editor(
+                    [
+                        {
+                            "file": file.name,
+                            "size_mb": round(file.size / (1024 * 1024), 2),
+                            "type": DOC_TYPE_LABELS[DOC_TYPE_OPTIONS[0]],
+                        }
+                        for file in uploaded_files
+                    ],
+                    column_config={
+                        "file": st.column_config.TextColumn("📄 File"),
+                        "size_mb": st.column_config.NumberColumn("Size (MB)", format="%.2f"),
+                        "type": st.column_config.SelectboxColumn(
+                            "Document Type",
+                            options=list(DOC_TYPE_LABELS.values()),
+                            required=True,
+                        ),
+                    },
+                    disabled=("file", "size_mb"),
+                    hide_index=True,
+                    use_container_width=True,
+                )
+                document_types = [_DOC_TYPE_BY_LABEL[row["type"]] for row in classified]
 
                 if st.button("📤 Upload Documents", type="primary"):
                     if upload_documents(uploaded_files, document_types):
                         st.session_state.documents_uploaded = True
-                        # Save context to URL for persistence
-                        save_session_to_url()
                         st.rerun()
 
             # Show uploaded documents summary after successful upload
@@ -963,24 +1488,7 @@ def main():
                             with st.container():
                                 col1, col2 = st.columns([3, 1])
                                 with col1:
-                                    doc_type_display = {
-                                        "emirates_id": "🆔 Emirates ID",
-                                        "bank_statement": "🏦 Bank Statement",
-                                        "credit_report": "📊 Credit Report",
-                                        "resume": "📄 Resume/CV",
-                                        "assets_liabilities": "💰 Assets & Liabilities",
-                                        "salary_certificate": "💼 Salary Certificate",
-                                        "trade_license": "🏢 Trade License",
-                                        "passport": "📘 Passport",
-                                        "visa": "🛂 Visa",
-                                        "utility_bill": "⚡ Utility Bill",
-                                        "rental_agreement": "🏠 Rental Agreement",
-                                        "family_book": "👨‍👩‍👧‍👦 Family Book",
-                                        "medical_report": "🏥 Medical Report",
-                                        "insurance_policy": "🛡️ Insurance Policy",
-                                        "general": "📎 General Document",
-                                        "other": "📎 Other Document"
-                                    }.get(doc.get("type", "general"), "📎 Document")
+                                    doc_type_display = UPLOADED_DOC_TYPE_LABELS.get(doc.get("type", "general"), "📎 Document")
                                     
                                     st.markdown(f"**{doc_type_display}**: {doc.get('filename', 'Unknown')}")
                                     
@@ -1001,7 +1509,7 @@ def main():
                             if i < len(st.session_state.uploaded_documents) - 1:
                                 st.divider()
                     
-                    elif hasattr(st.session_state, 'uploaded_docs_summary'):
+                    elif 'uploaded_docs_summary' in st.session_state:
                         st.text(st.session_state.uploaded_docs_summary)
                     else:
                         st.info("Document summary will appear here after upload.")
@@ -1013,192 +1521,18 @@ def main():
                     if start_processing():
                         st.session_state.processing_started = True
                         add_chat_message("assistant", "🔄 Your application is now being processed by our AI agents. This typically takes 2-5 minutes.")
-                        # Save context to URL for persistence
-                        save_session_to_url()
                         st.rerun()
 
             else:
                 st.info("Processing in progress... Check the status in the sidebar.")
 
     with tab4:
-        st.header("📊 Application Results")
-
-        # Debug info for troubleshooting
-        if st.session_state.application_id:
-            st.info(f"🔍 **Application ID**: {st.session_state.application_id}")
-
-            # Check processing status first
-            status = get_processing_status()
-            current_status = status.get("status", "unknown")
-
-            if current_status != "unknown" and current_status != "error":
-                # Show processing status
-                st.subheader("📊 Processing Status")
-
-                if current_status == "initialized":
-                    st.info("🔄 **Status**: Initialized - Ready for processing")
-                elif current_status == "processing":
-                    st.warning("⏳ **Status**: Processing in progress...")
-                    progress = status.get("progress", 0)
-                    st.progress(progress / 100)
-                    if status.get("current_stage"):
-                        st.text(f"Current Stage: {status.get('current_stage')}")
-                elif current_status == "completed":
-                    st.success("✅ **Status**: Processing completed!")
-                elif current_status == "failed":
-                    st.error("❌ **Status**: Processing failed")
-                else:
-                    st.warning(f"⚠️ **Status**: {current_status}")
-
-                st.divider()
-
-            # Get detailed application information
-            details = get_application_details()
-
-            if "error" not in details:
-                # Display application summary
-                app_info = details.get("application", {})
-                applicant_info = details.get("applicant", {})
-
-                col1, col2 = st.columns(2)
-
-                with col1:
-                    st.subheader("👤 Applicant Information")
-                    if applicant_info:
-                        st.text(f"Name: {applicant_info.get('name', 'N/A')}")
-                        st.text(f"Emirates ID: {applicant_info.get('emirates_id', 'N/A')}")
-                        st.text(f"Email: {applicant_info.get('email', 'N/A')}")
-                        st.text(f"Phone: {applicant_info.get('phone', 'N/A')}")
-
-                with col2:
-                    st.subheader("📋 Application Status")
-                    st.text(f"Type: {app_info.get('type', 'N/A').replace('_', ' ').title()}")
-                    st.text(f"Status: {app_info.get('status', 'N/A').title()}")
-                    st.text(f"Submitted: {app_info.get('submitted_at', 'N/A')[:19] if app_info.get('submitted_at') else 'N/A'}")
-
-                # Display documents
-                documents = details.get("documents", [])
-                if documents:
-                    st.subheader("📄 Uploaded Documents")
-                    doc_df = pd.DataFrame(documents)
-                    st.dataframe(doc_df[['type', 'filename', 'size', 'uploaded_at']], use_container_width=True)
-
-                # Display processing results if available
-                processing_status = details.get("processing_status", {})
-                if processing_status.get("status") == "completed":
-                    st.subheader("🎯 Processing Results")
-
-                    result_data = processing_status.get("result", {})
-                    if result_data:
-                        # Display agent responses
-                        agent_responses = result_data.get("agent_responses", [])
-                        if agent_responses:
-                            st.success("✅ **Processing Complete**")
-                            for i, response in enumerate(agent_responses):
-                                agent_name = response.get('agent', f'Agent {i+1}').replace('_', ' ').title()
-                                with st.expander(f"🤖 {agent_name}: {response.get('message', 'No message')[:50]}..."):
-                                    col1, col2 = st.columns([1, 3])
-                                    with col1:
-                                        if response.get('success'):
-                                            st.success("✅ Success")
-                                        else:
-                                            st.error("❌ Failed")
-                                    with col2:
-                                        st.write(response.get('message', 'No message available'))
-
-                        # Display final decision
-                        if result_data.get('decision'):
-                            decision = result_data['decision']
-                            if decision.lower() == 'approved':
-                                st.success(f"🎉 **Application Approved**")
-                                if result_data.get('support_amount'):
-                                    st.info(f"💰 **Monthly Support**: AED {result_data['support_amount']:,}")
-                            elif decision.lower() == 'declined':
-                                st.error("❌ **Application Declined**")
-                            else:
-                                st.warning("⏳ **Under Review**")
-
-                            if result_data.get('message'):
-                                st.write(result_data['message'])
-
-                # Real-time status updates
-                if st.button("🔄 Refresh Results"):
-                    st.rerun()
-
-            else:
-                st.error(f"❌ Error loading application details: {details.get('error')}")
-
-                # Show basic info from session state if available
-                if st.session_state.form_data:
-                    st.warning("📋 **Showing basic information from your session:**")
-                    with st.expander("Application Information", expanded=True):
-                        data = st.session_state.form_data
-                        col1, col2 = st.columns(2)
-
-                        with col1:
-                            st.write("**Personal Information:**")
-                            if data.get("first_name") or data.get("last_name"):
-                                st.write(f"• Name: {data.get('first_name', '')} {data.get('last_name', '')}")
-                            if data.get("emirates_id"):
-                                st.write(f"• Emirates ID: {data.get('emirates_id')}")
-
-                        with col2:
-                            st.write("**Application Details:**")
-                            if data.get("application_type"):
-                                app_type = "Financial Support" if data.get("application_type") == "financial_support" else "Economic Enablement"
-                                st.write(f"• Type: {app_type}")
-                            if data.get("urgency_level"):
-                                st.write(f"• Urgency: {data.get('urgency_level').title()}")
-
-                # Show instructions for troubleshooting
-                st.info("💡 **Troubleshooting:**")
-                st.write("1. Make sure you have submitted an application")
-                st.write("2. Upload documents in the Documents tab")
-                st.write("3. Start processing to see results")
-
-        else:
-            st.info("📋 **No application found.** Please submit an application first.")
-
-            # Show helpful next steps
-            st.markdown("""
-            ### 🚀 **How to see results:**
-            1. **📋 Go to Application Form** - Submit your application
-            2. **📄 Go to Documents** - Upload required documents
-            3. **🚀 Start Processing** - Begin application review
-            4. **📊 Return here** - View your results
-
-            ### 📈 **What you'll see here:**
-            - ✅ Application processing status
-            - 📊 Progress indicators
-            - 🎯 Final decision (Approved/Declined)
-            - 💰 Support amount (if approved)
-            - 🤖 Detailed agent analysis
-            """)
+        # Auto-refresh the results only while processing is under way
+        processing = st.session_state.last_status == "processing"
+        st.fragment(results_panel, run_every=RESULTS_REFRESH_SECONDS if processing else None)(processing)
 
     # Profile and application history functionality removed for core MVP
     # These features can be re-enabled when multi-user authentication is fully deployed
 
 if __name__ == "__main__":
-    # Add some custom CSS
-    st.markdown("""
-    <style>
-    .stApp {
-        max-width: 1200px;
-    }
-    .chat-message {
-        padding: 10px;
-        border-radius: 10px;
-        margin: 5px 0;
-    }
-    .user-message {
-        background-color: #e3f2fd;
-        margin-left: 20px;
-    }
-    .assistant-message {
-        background-color: #f5f5f5;
-        margin-right: 20px;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
-    main()
\ No newline at end of file
+    main()
@@ -4,13 +4,57 @@ Authentication components for Streamlit frontend
 
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-from typing import Dict, Any, Optional
-from datetime import datetime
+import logging
+import re
+import copy
+import base64
+from functools import lru_cache
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
 import time
 
+logger = logging.getLogger(__name__)
+
 # API URLs
 AUTH_API_URL = "http://localhost:8002"
+API_BASE_URL = "http://localhost:8000"
+
+# One @, no whitespace, and a dot in the domain part
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+# Oldest chat turns are dropped beyond this many messages
+CHAT_HISTORY_LIMIT = 50
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Keep-alive session for the auth and user APIs, shared across reruns and users"""
+    session = requests.Session()
+    # Transient gateway errors are retried for idempotent methods only (urllib3 default)
+    retry = Retry(total=2, backoff_factor=0.1, status_forcelist=(502, 503, 504), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # Open a connection to each backend in the background so the first real call reuses it
+    for health_url in (f"{AUTH_API_URL}/auth/health", f"{API_BASE_URL}/health"):
+        get_background_executor().submit(_warm_up, session, health_url)
+    return session
+
+def _warm_up(session: requests.Session, url: str):
+    """Prime the connection pool with a throwaway GET; failures are irrelevant here"""
+    try:
+        session.get(url, timeout=2)
+    except requests.exceptions.RequestException:
+        pass
+
+@st.cache_resource
+def get_background_executor() -> ThreadPoolExecutor:
+    """Small worker pool for auth and dashboard requests that can overlap"""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="auth")
 
 def restore_session_if_valid():
     """Try to restore session by checking if stored token is still valid"""
@@ -24,10 +68,21 @@ def restore_session_if_valid():
         st.session_state.user_token = token
         st.session_state.logged_in = True
 
+        # The details lookup doesn't depend on the token check, so both run at once
+        headers = {"Authorization": f"Bearer {token}"}
+        try:
+            app_id = int(query_params["application_id"]) if "application_id" in query_params else None
+        except ValueError:
+            app_id = None  # Invalid application ID in URL
+        details_future = None
+        if app_id is not None:
+            details_future = get_background_executor().submit(
+                get_http_session().get, f"{API_BASE_URL}/applications/{app_id}/details", headers=headers, timeout=3
+            )
+
         try:
             # Validate token with backend (shorter timeout for better UX)
-            headers = {"Authorization": f"Bearer {token}"}
-            response = requests.get(f"{AUTH_API_URL}/auth/me", headers=headers, timeout=3)
+            response = get_http_session().get(f"{AUTH_API_URL}/auth/me", headers=headers, timeout=3)
 
             if response.status_code == 200:
                 user_data = response.json()
@@ -35,15 +90,12 @@ def restore_session_if_valid():
                 st.session_state.user_info = user_data.get("user", {})
 
                 # Also restore application context if available
-                if "application_id" in query_params:
+                if app_id is not None:
+                    st.session_state.application_id = app_id
+                    st.session_state.application_submitted = True
                     try:
-                        app_id = int(query_params["application_id"])
-                        st.session_state.application_id = app_id
-                        st.session_state.application_submitted = True
-
                         # Check if documents were uploaded
-                        doc_response = requests.get(f"http://localhost:8000/applications/{app_id}/details",
-                                                   headers=headers, timeout=3)
+                        doc_response = details_future.result()
                         if doc_response.status_code == 200:
                             details = doc_response.json()
                             if details.get("documents"):
@@ -70,67 +122,74 @@ def restore_session_if_valid():
         except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
             # Network error - keep session for offline use
             return True
-        except Exception:
-            # Other errors - keep session
+        except (requests.exceptions.RequestException, ValueError):
+            # Other request errors or an unreadable response - keep session
             return True
 
     return False
 
 def save_session_to_url():
     """Save session token and application context to URL for basic persistence"""
+    desired = {}
     if st.session_state.logged_in and st.session_state.user_token:
         # Always ensure token is in URL for persistence across page reloads
-        if st.query_params.get("auth_token") != st.session_state.user_token:
-            st.query_params["auth_token"] = st.session_state.user_token
+        desired["auth_token"] = st.session_state.user_token
 
     # Save application context for both authenticated and anonymous users
-    if hasattr(st.session_state, 'application_id') and st.session_state.application_id:
-        if st.query_params.get("application_id") != str(st.session_state.application_id):
-            st.query_params["application_id"] = str(st.session_state.application_id)
+    if st.session_state.get("application_id"):
+        desired["application_id"] = str(st.session_state.application_id)
+
+    # Nothing changed since the last sync: skip reading the URL at all
+    synced = tuple(desired.items())
+    if st.session_state.get("url_synced") == synced:
+        return
+
+    query_params = st.query_params
+    updates = {key: value for key, value in desired.items() if query_params.get(key) != value}
+    if updates:
+        query_params.update(updates)
+    st.session_state.url_synced = synced
+
+# Session state defaults (copied on first use so sessions never share mutable values)
+_SESSION_DEFAULTS = (
+    # Authentication state
+    ("logged_in", False),
+    ("user_token", None),
+    ("user_info", {}),
+    ("auth_error", None),
+    ("session_restored", False),
+    # Application state
+    ("application_id", None),
+    ("application_submitted", False),
+    ("documents_uploaded", False),
+    ("uploaded_documents", []),
+    ("processing_started", False),
+    ("details_key", None),
+    ("last_status", None),
+    ("chat_messages", deque(maxlen=CHAT_HISTORY_LIMIT)),
+    ("last_update_key", None),
+    ("url_synced", None),
+    ("dashboard_data", None),
+    # Form data persistence
+    ("form_data", {}),
+    ("form_edit_mode", False),
+    ("form_data_loaded", False),
+)
 
 def init_session_state():
     """Initialize session state for authentication and application context"""
-    # Initialize authentication state
-    if "logged_in" not in st.session_state:
-        st.session_state.logged_in = False
-    if "user_token" not in st.session_state:
-        st.session_state.user_token = None
-    if "user_info" not in st.session_state:
-        st.session_state.user_info = {}
-    if "auth_error" not in st.session_state:
-        st.session_state.auth_error = None
-    if "session_restored" not in st.session_state:
-        st.session_state.session_restored = False
-
-    # Initialize application state
-    if "application_id" not in st.session_state:
-        st.session_state.application_id = None
-    if "application_submitted" not in st.session_state:
-        st.session_state.application_submitted = False
-    if "documents_uploaded" not in st.session_state:
-        st.session_state.documents_uploaded = False
-    if "uploaded_documents" not in st.session_state:
-        st.session_state.uploaded_documents = []
-    if "processing_started" not in st.session_state:
-        st.session_state.processing_started = False
-    if "chat_messages" not in st.session_state:
-        st.session_state.chat_messages = []
-
-    # Initialize form data persistence
-    if "form_data" not in st.session_state:
-        st.session_state.form_data = {}
-    if "form_edit_mode" not in st.session_state:
-        st.session_state.form_edit_mode = False
+    session_state = st.session_state
+    # Defaults and URL restoration only need to happen on a session's first run
+    if session_state.get("session_initialized"):
+        return
+    for key, default in _SESSION_DEFAULTS:
+        session_state.setdefault(key, copy.copy(default))
 
     # Try to restore session on first load or if not already restored
     if not st.session_state.logged_in and not st.session_state.session_restored:
         if restore_session_if_valid():
             st.session_state.session_restored = True
 
-    # Initialize form data loading flag
-    if "form_data_loaded" not in st.session_state:
-        st.session_state.form_data_loaded = False
-
     # Check for application_id in URL params for anonymous users
     if not st.session_state.application_id:
         query_params = st.query_params
@@ -143,27 +202,32 @@ def init_session_state():
             except ValueError:
                 pass  # Invalid application ID in URL
 
+    session_state.session_initialized = True
+
+@lru_cache(maxsize=128)
+def _validation_error_message(error_type: Optional[str], loc: Tuple[Any, ...], msg: Optional[str]) -> str:
+    """User-friendly message for one FastAPI validation error"""
+    if error_type == "value_error" and "email" in loc:
+        if "An email address must have an @-sign" in (msg or ""):
+            return "Please enter a valid email address with an @ sign"
+        if "The part after the @-sign is not valid" in (msg or ""):
+            return "Please enter a valid email address (e.g., user@example.com)"
+        return "Please enter a valid email address"
+    # General error message
+    field = str(loc[-1]) if loc else "field"
+    return f"{field.title()}: {msg if msg is not None else 'Invalid value'}"
+
 def parse_validation_errors(error_data):
     """Parse validation errors and return user-friendly messages"""
     if isinstance(error_data, dict):
         detail = error_data.get("detail", "")
 
-        # Handle FastAPI validation errors
+        # Handle FastAPI validation errors; the same few errors recur across attempts
         if isinstance(detail, list):
-            errors = []
-            for error in detail:
-                if error.get("type") == "value_error" and "email" in error.get("loc", []):
-                    if "An email address must have an @-sign" in error.get("msg", ""):
-                        errors.append("Please enter a valid email address with an @ sign")
-                    elif "The part after the @-sign is not valid" in error.get("msg", ""):
-                        errors.append("Please enter a valid email address (e.g., user@example.com)")
-                    else:
-                        errors.append("Please enter a valid email address")
-                else:
-                    # General error message
-                    field = error.get("loc", [""])[-1] if error.get("loc") else "field"
-                    msg = error.get("msg", "Invalid value")
-                    errors.append(f"{field.title()}: {msg}")
+            errors = [
+                _validation_error_message(error.get("type"), tuple(error.get("loc") or ()), error.get("msg"))
+                for error in detail
+            ]
             return "; ".join(errors) if errors else "Validation error"
         else:
             return detail
@@ -173,7 +237,7 @@ def parse_validation_errors(error_data):
 def login_user(email: str, password: str) -> bool:
     """Login user and store token"""
     try:
-        response = requests.post(
+        response = get_http_session().post(
             f"{AUTH_API_URL}/auth/login",
             json={"email": email, "password": password},
             timeout=10
@@ -201,8 +265,10 @@ def login_user(email: str, password: str) -> bool:
     except requests.exceptions.Timeout:
         st.session_state.auth_error = "Login request timed out. Please try again."
         return False
-    except Exception as e:
-        st.session_state.auth_error = f"Login error: {str(e)}"
+    except (requests.exceptions.RequestException, ValueError, KeyError):
+        # Other request errors or a malformed response; details go to the log
+        logger.exception("Login request failed")
+        st.session_state.auth_error = "Login failed due to an unexpected response. Please try again."
         return False
 
 def register_user(email: str, password: str, full_name: str, phone: str = "") -> bool:
@@ -216,7 +282,7 @@ def register_user(email: str, password: str, full_name: str, phone: str = "") ->
         if phone:
             user_data["phone"] = phone
 
-        response = requests.post(
+        response = get_http_session().post(
             f"{AUTH_API_URL}/auth/register",
             json=user_data,
             timeout=10
@@ -244,12 +310,16 @@ def register_user(email: str, password: str, full_name: str, phone: str = "") ->
     except requests.exceptions.Timeout:
         st.session_state.auth_error = "Registration request timed out. Please try again."
         return False
-    except Exception as e:
-        st.session_state.auth_error = f"Registration error: {str(e)}"
+    except (requests.exceptions.RequestException, ValueError, KeyError):
+        # Other request errors or a malformed response; details go to the log
+        logger.exception("Registration request failed")
+        st.session_state.auth_error = "Registration failed due to an unexpected response. Please try again."
         return False
 
 def logout_user():
     """Logout user and clear session"""
+    if st.session_state.user_token:
+        _verify_token_remote.clear(st.session_state.user_token)
     st.session_state.logged_in = False
     st.session_state.user_token = None
     st.session_state.user_info = {}
@@ -258,58 +328,106 @@ def logout_user():
     # Clear the token from URL
     if "auth_token" in st.query_params:
         st.query_params.clear()
+    st.session_state.url_synced = None
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _verify_token_remote(token: str) -> Tuple[int, Dict[str, Any]]:
+    """Check a token with the auth service; results are shared by all sessions for 5 minutes
+
+    Only definitive answers (200, 401, 403) are cached; any other status raises,
+    so a transient server error is retried on the next check instead of replayed.
+    """
+    response = get_http_session().post(
+        f"{AUTH_API_URL}/auth/verify",
+        headers={"Authorization": f"Bearer {token}"},
+        timeout=3
+    )
+    if response.status_code not in (200, 401, 403):
+        raise requests.exceptions.HTTPError(
+            f"Token verification returned {response.status_code}", response=response
+        )
+    data = response.json() if response.status_code == 200 else {}
+    return response.status_code, data
+
+@lru_cache(maxsize=128)
+def _token_exp(token: str) -> Optional[float]:
+    """Expiry claim of a JWT, read locally without checking the signature"""
+    try:
+        payload = token.split(".")[1]
+        return float(json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
 
 def verify_token() -> bool:
     """Verify current token is valid"""
     if not st.session_state.user_token:
         return False
 
+    # A token that is still well within its expiry only needs the server for the user info
+    exp = _token_exp(st.session_state.user_token)
+    if st.session_state.user_info and exp is not None and exp > time.time() + 30:
+        return True
+
     try:
-        headers = {"Authorization": f"Bearer {st.session_state.user_token}"}
-        response = requests.post(
-            f"{AUTH_API_URL}/auth/verify",
-            headers=headers,
-            timeout=3
-        )
+        status_code, data = _verify_token_remote(st.session_state.user_token)
 
-        if response.status_code == 200:
-            data = response.json()
+        if status_code == 200:
             if data.get("valid"):
                 st.session_state.user_info = data.get("user", {})
                 return True
 
         # Token invalid - only logout if we get a clear 401/403
-        if response.status_code in [401, 403]:
+        if status_code in [401, 403]:
             logout_user()
             return False
-        else:
-            # Other errors (500, etc.) - keep session
-            return True
+        # A 200 that does not mark the token valid - keep session
+        return True
 
     except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
         # Network error or service unavailable - keep session for offline use
         return True
-    except Exception:
-        # Other errors - keep session
+    except (requests.exceptions.RequestException, ValueError):
+        # Other request errors (including 5xx, which are not cached) or an
+        # unreadable response - keep session
         return True
 
-def get_auth_headers() -> Dict[str, str]:
-    """Get authentication headers for API requests"""
-    if st.session_state.user_token:
-        return {"Authorization": f"Bearer {st.session_state.user_token}"}
-    return {}
+@lru_cache(maxsize=128)
+def _bearer_headers(token: Optional[str]) -> Mapping[str, str]:
+    # Read-only, since the same mapping is handed to every caller for this token
+    return MappingProxyType({"Authorization": f"Bearer {token}"} if token else {})
+
+def get_auth_headers() -> Mapping[str, str]:
+    """Get authentication headers for API requests (built once per token)"""
+    return _bearer_headers(st.session_state.user_token)
 
 def validate_email(email: str) -> str:
     """Validate email format and return error message if invalid"""
     if not email:
         return "Email is required"
+    if _EMAIL_RE.fullmatch(email):
+        return ""
+    # Invalid: the branchy checks below only pick the message
     if "@" not in email:
         return "Please enter a valid email address with an @ sign"
-    if "." not in email.split("@")[-1]:
+    if "." not in email.rpartition("@")[2]:
         return "Please enter a valid email address (e.g., user@example.com)"
-    if len(email.split("@")) != 2:
-        return "Please enter a valid email address"
-    return ""
+    return "Please enter a valid email address"
+
+def _is_strong_password(password: str) -> bool:
+    """Whether password has an uppercase letter, a lowercase letter and a digit (one pass)"""
+    has_upper = has_lower = has_digit = False
+    for c in password:
+        if c.isupper():
+            has_upper = True
+        elif c.islower():
+            has_lower = True
+        elif c.isdigit():
+            has_digit = True
+        else:
+            continue
+        if has_upper and has_lower and has_digit:
+            return True
+    return False
 
 def show_login_form():
     """Display login form"""
@@ -400,14 +518,8 @@ def show_register_form():
                 errors.append("Password is required")
             elif len(password) < 8:
                 errors.append("Password must be at least 8 characters")
-            else:
-                # Password strength check
-                has_upper = any(c.isupper() for c in password)
-                has_lower = any(c.islower() for c in password)
-                has_digit = any(c.isdigit() for c in password)
-
-                if not (has_upper and has_lower and has_digit):
-                    errors.append("Password must contain uppercase, lowercase, and number")
+            elif not _is_strong_password(password):
+                errors.append("Password must contain uppercase, lowercase, and number")
 
             # Display errors
             if errors:
@@ -423,17 +535,28 @@ def show_register_form():
                         if st.session_state.auth_error:
                             st.error(f"❌ {st.session_state.auth_error}")
 
+@st.cache_data(ttl=30, show_spinner=False)
+def _check_auth_available() -> bool:
+    """Probe the auth service's health endpoint; shared by all sessions for 30 seconds"""
+    try:
+        response = get_http_session().get(f"{AUTH_API_URL}/auth/health", timeout=3)
+        return response.status_code == 200
+    except requests.exceptions.RequestException:
+        return False
+
+@st.fragment
 def show_auth_page():
-    """Main authentication page"""
+    """Main authentication page
+
+    Runs as a fragment: failed logins and other interactions on this page rerun
+    only the page itself, not the session and token checks in front of it.
+    Anything that signs the user in calls st.rerun(), which reruns the whole app.
+    """
     st.title("🤝 AI Social Support Application")
     st.markdown("**Secure Access to Your Social Support Services**")
 
     # Check if auth service is available
-    try:
-        response = requests.get(f"{AUTH_API_URL}/auth/health", timeout=3)
-        auth_available = response.status_code == 200
-    except:
-        auth_available = False
+    auth_available = _check_auth_available()
 
     if not auth_available:
         st.warning("⚠️ Authentication service is currently unavailable")
@@ -511,16 +634,16 @@ def check_authentication():
     # Verify token if logged in (but only periodically to avoid constant network calls)
     if st.session_state.logged_in and st.session_state.logged_in != "anonymous":
         # Only verify token occasionally (every few minutes) or if user_info is missing
-        if not st.session_state.user_info or not hasattr(st.session_state, 'last_token_check'):
+        last_token_check = st.session_state.get("last_token_check")
+        if not st.session_state.user_info or last_token_check is None:
             if not verify_token():
                 st.session_state.logged_in = False
             else:
                 st.session_state.last_token_check = time.time()
-        elif hasattr(st.session_state, 'last_token_check'):
-            # Check if it's been more than 5 minutes since last check
-            if time.time() - st.session_state.last_token_check > 300:  # 5 minutes
-                verify_token()
-                st.session_state.last_token_check = time.time()
+        # Check if it's been more than 5 minutes since last check
+        elif time.time() - last_token_check > 300:  # 5 minutes
+            verify_token()
+            st.session_state.last_token_check = time.time()
 
     # Show auth page if not logged in
     if not st.session_state.logged_in:
@@ -4,30 +4,85 @@ User dashboard components for profile management and application history
 
 import streamlit as st
 import requests
-import pandas as pd
-from typing import Dict, Any, List
+import heapq
+from collections import Counter
+from operator import itemgetter
+from typing import Dict, Any, List, Tuple
 from datetime import datetime
 import json
 
-# API URLs
-AUTH_API_URL = "http://localhost:8002"
+try:
+    import orjson
+except ImportError:  # optional C parser; fall back to stdlib json
+    orjson = None
 
-def get_auth_headers() -> Dict[str, str]:
-    """Get authentication headers"""
-    if st.session_state.user_token:
-        return {"Authorization": f"Bearer {st.session_state.user_token}"}
-    return {}
+from auth_components import AUTH_API_URL, get_auth_headers, get_http_session
+
+def _loads(data):
+    """Parse JSON text or bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _iso_day(timestamp: str) -> str:
+    """YYYY-MM-DD part of an ISO 8601 timestamp, by slicing instead of parsing"""
+    return timestamp[:10]
+
+def _iso_minute(timestamp: str) -> str:
+    """ISO 8601 timestamp shown as 'YYYY-MM-DD HH:MM'"""
+    return timestamp[:16].replace("T", " ")
+
+# How long dashboard data is reused before it is fetched again
+DASHBOARD_CACHE_TTL = 30
+
+def _safe_int(data: Dict[str, Any], key: str, default: int) -> int:
+    """data[key] as an int, or default when it is missing, empty or not numeric"""
+    value = data.get(key)
+    try:
+        return int(value) if value else default
+    except (TypeError, ValueError):
+        return default
+
+PROFILE_EMPLOYMENT_OPTIONS = ("employed", "unemployed", "self_employed", "student", "retired")
+_PROFILE_EMPLOYMENT_INDEX = {option: i for i, option in enumerate(PROFILE_EMPLOYMENT_OPTIONS)}
+
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL, show_spinner=False)
+def _fetch_user_resource(path: str, token: str) -> Dict[str, Any]:
+    """GET a /users resource for a token; errors raise so they are never cached"""
+    response = get_http_session().get(
+        f"{AUTH_API_URL}{path}", headers={"Authorization": f"Bearer {token}"}, timeout=10
+    )
+    response.raise_for_status()
+    return _loads(response.content)
+
+def get_dashboard_data() -> Dict[str, Any]:
+    """Profile, applications and documents in one request, with per-part errors
+
+    Loaded on first use and kept in session state for the user's token, so tab
+    fragments and later reruns read it without refetching or re-copying the
+    cached bundle. The Refresh button and profile updates drop it.
+    """
+    token = st.session_state.user_token
+    cached = st.session_state.get("dashboard_data")
+    if cached is None or cached[0] != token:
+        data = _fetch_user_resource("/users/dashboard", token)
+        data["applications"] = [_with_labels(app) for app in data.get("applications") or []]
+        cached = (token, data)
+        st.session_state.dashboard_data = cached
+    return cached[1]
+
+def clear_dashboard_cache():
+    """Drop cached dashboard data so the next render refetches it"""
+    _fetch_user_resource.clear()
+    st.session_state.dashboard_data = None
 
 def get_user_profile() -> Dict[str, Any]:
     """Get user profile data"""
     try:
-        headers = get_auth_headers()
-        response = requests.get(f"{AUTH_API_URL}/users/profile", headers=headers, timeout=10)
-
-        if response.status_code == 200:
-            return response.json()
-        else:
-            return {}
+        # A missing or failed profile comes back as None with an entry in "errors"
+        return get_dashboard_data()["profile"] or {}
+    except requests.exceptions.HTTPError:
+        return {}
     except Exception as e:
         st.error(f"Failed to load profile: {e}")
         return {}
@@ -36,7 +91,7 @@ def update_user_profile(profile_data: Dict[str, Any]) -> bool:
     """Update user profile"""
     try:
         headers = get_auth_headers()
-        response = requests.put(
+        response = get_http_session().put(
             f"{AUTH_API_URL}/users/profile",
             headers=headers,
             json=profile_data,
@@ -44,26 +99,32 @@ def update_user_profile(profile_data: Dict[str, Any]) -> bool:
         )
 
         if response.status_code == 200:
+            _fetch_user_resource.clear("/users/dashboard", st.session_state.user_token)
+            st.session_state.dashboard_data = None
             return True
         else:
-            error_data = response.json()
-            st.error(f"Failed to update profile: {error_data.get('detail', 'Unknown error')}")
+            if response.headers.get("content-type", "").startswith("application/json"):
+                detail = _loads(response.content).get("detail", "Unknown error")
+            else:
+                detail = response.text[:200] or f"HTTP {response.status_code}"
+            st.error(f"Failed to update profile: {detail}")
             return False
     except Exception as e:
         st.error(f"Failed to update profile: {e}")
         return False
 
+def _with_labels(application: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the display forms of type and status, formatted once per fetch"""
+    application["type_label"] = application["application_type"].replace("_", " ").title()
+    application["status_label"] = application["status"].title()
+    return application
+
 def get_user_applications() -> List[Dict[str, Any]]:
     """Get user applications"""
     try:
-        headers = get_auth_headers()
-        response = requests.get(f"{AUTH_API_URL}/users/applications", headers=headers, timeout=10)
-
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("applications", [])
-        else:
-            return []
+        return get_dashboard_data()["applications"]
+    except requests.exceptions.HTTPError:
+        return []
     except Exception as e:
         st.error(f"Failed to load applications: {e}")
         return []
@@ -71,18 +132,14 @@ def get_user_applications() -> List[Dict[str, Any]]:
 def get_user_documents() -> List[Dict[str, Any]]:
     """Get user documents"""
     try:
-        headers = get_auth_headers()
-        response = requests.get(f"{AUTH_API_URL}/users/documents", headers=headers, timeout=10)
-
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("documents", [])
-        else:
-            return []
+        return get_dashboard_data()["documents"]
+    except requests.exceptions.HTTPError:
+        return []
     except Exception as e:
         st.error(f"Failed to load documents: {e}")
         return []
 
+@st.fragment
 def show_user_profile():
     """Display and edit user profile"""
     st.header("👤 User Profile")
@@ -100,80 +157,59 @@ def show_user_profile():
         st.info("You can still update your profile information below.")
         profile = {}
 
-    # Profile form
-    try:
-        with st.form("profile_form"):
-            st.info("👤 **Profile Guide**: All fields are optional. Complete your profile to save time on future applications.")
-            st.subheader("Personal Information")
-
-            col1, col2 = st.columns(2)
-
-            with col1:
-                phone = st.text_input(
-                    "Phone Number (Optional)",
-                    value=profile.get("phone", ""),
-                    placeholder="+971 XX XXX XXXX"
-                )
-                emirates_id = st.text_input(
-                    "Emirates ID (Optional)",
-                    value=profile.get("emirates_id", ""),
-                    placeholder="784-XXXX-XXXXXXX-X"
-                )
-                # Safe family size conversion
-                try:
-                    family_size_value = int(profile.get("family_size", 1)) if profile.get("family_size") else 1
-                except (ValueError, TypeError):
-                    family_size_value = 1
-
-                family_size = st.number_input(
-                    "Family Size (Optional)",
-                    min_value=1,
-                    value=family_size_value
-                )
-
-            with col2:
-                # Safe date parsing
-                date_of_birth_value = None
-                if profile.get("date_of_birth"):
-                    try:
-                        date_of_birth_value = datetime.fromisoformat(profile["date_of_birth"]).date()
-                    except (ValueError, TypeError):
-                        date_of_birth_value = None
-
-                date_of_birth = st.date_input(
-                    "Date of Birth (Optional)",
-                    value=date_of_birth_value,
-                    min_value=datetime(1900, 1, 1).date(),
-                    max_value=datetime.now().date()
-                )
-
-                # Safe employment status selection
-                employment_options = ["employed", "unemployed", "self_employed", "student", "retired"]
-                current_employment = profile.get("employment_status", "employed")
-
-                # Find index safely, default to 0 (employed) if not found
-                try:
-                    employment_index = employment_options.index(current_employment) if current_employment in employment_options else 0
-                except (ValueError, TypeError):
-                    employment_index = 0
+    # Profile form: every input and the submit button live inside the form, so
+    # editing fields doesn't rerun anything until the form is submitted
+    with st.form("profile_form"):
+        st.info("👤 **Profile Guide**: All fields are optional. Complete your profile to save time on future applications.")
+        st.subheader("Personal Information")
 
-                employment_status = st.selectbox(
-                    "Employment Status (Optional)",
-                    employment_options,
-                    index=employment_index
-                )
+        col1, col2 = st.columns(2)
 
-                # Safe monthly income conversion
+        with col1:
+            phone = st.text_input(
+                "Phone Number (Optional)",
+                value=profile.get("phone", ""),
+                placeholder="+971 XX XXX XXXX"
+            )
+            emirates_id = st.text_input(
+                "Emirates ID (Optional)",
+                value=profile.get("emirates_id", ""),
+                placeholder="784-XXXX-XXXXXXX-X"
+            )
+            family_size = st.number_input(
+                "Family Size (Optional)",
+                min_value=1,
+                value=_safe_int(profile, "family_size", 1)
+            )
+
+        with col2:
+            # Safe date parsing
+            date_of_birth_value = None
+            if profile.get("date_of_birth"):
                 try:
-                    monthly_income_value = int(profile.get("monthly_income", 0)) if profile.get("monthly_income") else 0
+                    date_of_birth_value = datetime.fromisoformat(profile["date_of_birth"]).date()
                 except (ValueError, TypeError):
-                    monthly_income_value = 0
+                    date_of_birth_value = None
+
+            date_of_birth = st.date_input(
+                "Date of Birth (Optional)",
+                value=date_of_birth_value,
+                min_value=datetime(1900, 1, 1).date(),
+                max_value=datetime.now().date()
+            )
+
+            # Unknown or missing statuses fall back to the first option (employed)
+            employment_status = st.selectbox(
+                "Employment Status (Optional)",
+                PROFILE_EMPLOYMENT_OPTIONS,
+                index=_PROFILE_EMPLOYMENT_INDEX.get(profile.get("employment_status"), 0)
+            )
 
-                monthly_income = st.number_input(
-                    "Monthly Income (AED) - Optional",
-                    min_value=0,
-                    value=monthly_income_value
-                )
+            monthly_income = st.number_input(
+                "Monthly Income (AED) - Optional",
+                min_value=0,
+                value=_safe_int(profile, "monthly_income", 0)
+            )
 
         address = st.text_area(
             "Address (Optional)",
@@ -186,16 +222,10 @@ def show_user_profile():
         col3, col4 = st.columns(2)
 
         with col3:
-            # Safe bank balance conversion
-            try:
-                bank_balance_value = int(profile.get("bank_balance", 0)) if profile.get("bank_balance") else 0
-            except (ValueError, TypeError):
-                bank_balance_value = 0
-
             bank_balance = st.number_input(
                 "Current Bank Balance (AED) - Optional",
                 min_value=0,
-                value=bank_balance_value
+                value=_safe_int(profile, "bank_balance", 0)
             )
 
         with col4:
@@ -206,29 +236,83 @@ def show_user_profile():
 
         submitted = st.form_submit_button("Update Profile", type="primary")
 
-        if submitted:
-            profile_data = {
-                "phone": phone if phone else None,
-                "emirates_id": emirates_id if emirates_id else None,
-                "date_of_birth": date_of_birth.isoformat() if date_of_birth else None,
-                "address": address if address else None,
-                "family_size": family_size,
-                "employment_status": employment_status,
-                "monthly_income": float(monthly_income) if monthly_income > 0 else None,
-                "bank_balance": float(bank_balance) if bank_balance > 0 else None,
-                "has_existing_support": has_existing_support
-            }
-
-            if update_user_profile(profile_data):
-                st.success("✅ Profile updated successfully!")
-                st.rerun()
-
-    except Exception as e:
-        st.error(f"Error in profile form: {e}")
-        st.info("Please refresh the page and try again.")
-
+    if submitted:
+        profile_data = {
+            "phone": phone if phone else None,
+            "emirates_id": emirates_id if emirates_id else None,
+            "date_of_birth": date_of_birth.isoformat() if date_of_birth else None,
+            "address": address if address else None,
+            "family_size": family_size,
+            "employment_status": employment_status,
+            "monthly_income": float(monthly_income) if monthly_income > 0 else None,
+            "bank_balance": float(bank_balance) if bank_balance > 0 else None,
+            "has_existing_support": has_existing_support
+        }
+
+        if update_user_profile(profile_data):
+            st.success("✅ Profile updated successfully!")
+            st.rerun()
+
+# Numeric columns stay numeric so they sort client-side; Streamlit formats them
+APPLICATION_COLUMN_CONFIG = {
+    "Support (AED)": st.column_config.NumberColumn(format="%.0f AED"),
+}
+DOCUMENT_COLUMN_CONFIG = {
+    "Size (KB)": st.column_config.NumberColumn(format="%.1f KB"),
+}
+
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL, show_spinner=False)
+def _application_rows(applications: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Display rows for the applications table, rebuilt only when the data changes"""
+    return [
+        {
+            "ID": app["id"],
+            "Type": app["type_label"],
+            "Status": app["status_label"],
+            "Decision": app.get("decision", "Pending").title(),
+            "Support (AED)": app.get("support_amount") or None,
+            "Submitted": _iso_day(app["submitted_at"]),
+            "Urgency": app.get("urgency_level", "Normal").title()
+        }
+        for app in applications
+    ]
+
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL, show_spinner=False)
+def _document_tables(documents: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Display rows for the documents table plus per-type counts for the chart"""
+    rows = [
+        {
+            "ID": doc["id"],
+            "Filename": doc["filename"],
+            "Type": doc["document_type"].replace("_", " ").title(),
+            "Size (KB)": doc.get("file_size", 0) / 1024,
+            "Application": doc.get("application_id", "N/A"),
+            "Uploaded": _iso_minute(doc["upload_date"])
+        }
+        for doc in documents
+    ]
+    doc_type_counts = Counter(row["Type"] for row in rows)
+    type_counts = [{"Type": doc_type, "Count": count} for doc_type, count in doc_type_counts.items()]
+    return rows, type_counts
+
+def _application_summary(applications: List[Dict[str, Any]]) -> Tuple[int, int, float]:
+    """Approved count, pending count and total support amount in a single pass"""
+    approved = pending = 0
+    total_support = 0
+    for app in applications:
+        if app.get("decision") == "approved":
+            approved += 1
+        if app.get("status") in ("submitted", "processing"):
+            pending += 1
+        total_support += app.get("support_amount") or 0
+    return approved, pending, total_support
+
+@st.fragment
 def show_application_history():
-    """Display user application history"""
+    """Display user application history
+
+    A fragment, so picking an application in the selectbox reruns only this tab.
+    """
     st.header("📋 Application History")
 
     applications = get_user_applications()
@@ -238,41 +322,30 @@ def show_application_history():
         return
 
     # Summary metrics
+    approved, pending, total_support = _application_summary(applications)
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
         st.metric("Total Applications", len(applications))
 
     with col2:
-        approved = len([app for app in applications if app.get("decision") == "approved"])
         st.metric("Approved", approved, delta=f"{approved/len(applications)*100:.1f}%" if applications else "0%")
 
     with col3:
-        pending = len([app for app in applications if app.get("status") in ["submitted", "processing"]])
         st.metric("Pending", pending)
 
     with col4:
-        total_support = sum([app.get("support_amount", 0) for app in applications if app.get("support_amount")])
         st.metric("Total Support (AED)", f"{total_support:,.0f}")
 
     st.divider()
 
     # Applications table
     if applications:
-        df_data = []
-        for app in applications:
-            df_data.append({
-                "ID": app["id"],
-                "Type": app["application_type"].replace("_", " ").title(),
-                "Status": app["status"].title(),
-                "Decision": app.get("decision", "Pending").title(),
-                "Support (AED)": f"{app.get('support_amount', 0):,.0f}" if app.get("support_amount") else "N/A",
-                "Submitted": datetime.fromisoformat(app["submitted_at"]).strftime("%Y-%m-%d"),
-                "Urgency": app.get("urgency_level", "Normal").title()
-            })
-
-        df = pd.DataFrame(df_data)
-        st.dataframe(df, use_container_width=True)
+        st.dataframe(
+            _application_rows(applications),
+            column_config=APPLICATION_COLUMN_CONFIG,
+            use_container_width=True
+        )
 
         # Detailed view
         st.subheader("Application Details")
@@ -292,12 +365,15 @@ def show_application_details(application: Dict[str, Any]):
     with st.expander(f"📄 Application #{application['id']} Details", expanded=True):
         col1, col2 = st.columns(2)
 
+        # Consecutive text lines go out as one markdown element each
         with col1:
-            st.write("**Basic Information:**")
-            st.write(f"Type: {application['application_type'].replace('_', ' ').title()}")
-            st.write(f"Status: {application['status'].title()}")
-            st.write(f"Urgency: {application.get('urgency_level', 'Normal').title()}")
-            st.write(f"Submitted: {datetime.fromisoformat(application['submitted_at']).strftime('%Y-%m-%d %H:%M')}")
+            st.markdown(
+                "**Basic Information:**\n\n"
+                f"Type: {application['type_label']}\n\n"
+                f"Status: {application['status_label']}\n\n"
+                f"Urgency: {application.get('urgency_level', 'Normal').title()}\n\n"
+                f"Submitted: {_iso_minute(application['submitted_at'])}"
+            )
 
         with col2:
             st.write("**Decision Information:**")
@@ -309,19 +385,21 @@ def show_application_details(application: Dict[str, Any]):
             else:
                 st.warning(f"⏳ {decision.title()}")
 
+            details = []
             if application.get("support_amount"):
-                st.write(f"Support Amount: AED {application['support_amount']:,.0f}")
-
+                details.append(f"Support Amount: AED {application['support_amount']:,.0f}")
             if application.get("decision_message"):
-                st.write(f"Message: {application['decision_message']}")
+                details.append(f"Message: {application['decision_message']}")
+            if details:
+                st.markdown("\n\n".join(details))
 
         # Applicant data
         if application.get("applicant_data"):
-            st.write("**Applicant Data:**")
+            lines = ["**Applicant Data:**"]
             applicant_data = application["applicant_data"]
             if isinstance(applicant_data, str):
                 try:
-                    applicant_data = json.loads(applicant_data)
+                    applicant_data = _loads(applicant_data)
                 except:
                     pass
 
@@ -330,8 +408,10 @@ def show_application_details(application: Dict[str, Any]):
                 key_fields = ["first_name", "last_name", "email", "phone", "monthly_income", "employment_status"]
                 for field in key_fields:
                     if field in applicant_data and applicant_data[field]:
-                        st.write(f"{field.replace('_', ' ').title()}: {applicant_data[field]}")
+                        lines.append(f"{field.replace('_', ' ').title()}: {applicant_data[field]}")
+            st.markdown("\n\n".join(lines))
 
+@st.fragment
 def show_document_library():
     """Display user document library"""
     st.header("📄 Document Library")
@@ -349,40 +429,23 @@ def show_document_library():
         st.metric("Total Documents", len(documents))
 
     with col2:
-        total_size = sum([doc.get("file_size", 0) for doc in documents])
+        total_size = sum(doc.get("file_size", 0) for doc in documents)
         st.metric("Total Size", f"{total_size / (1024*1024):.1f} MB")
 
     with col3:
-        doc_types = len(set([doc.get("document_type") for doc in documents]))
+        doc_types = len({doc.get("document_type") for doc in documents})
         st.metric("Document Types", doc_types)
 
     st.divider()
 
     # Documents table
     if documents:
-        df_data = []
-        for doc in documents:
-            df_data.append({
-                "ID": doc["id"],
-                "Filename": doc["filename"],
-                "Type": doc["document_type"].replace("_", " ").title(),
-                "Size (KB)": f"{doc.get('file_size', 0) / 1024:.1f}",
-                "Application": doc.get("application_id", "N/A"),
-                "Uploaded": datetime.fromisoformat(doc["upload_date"]).strftime("%Y-%m-%d %H:%M")
-            })
-
-        df = pd.DataFrame(df_data)
-        st.dataframe(df, use_container_width=True)
+        document_rows, type_counts = _document_tables(documents)
+        st.dataframe(document_rows, column_config=DOCUMENT_COLUMN_CONFIG, use_container_width=True)
 
         # Document type breakdown
         st.subheader("📊 Document Types")
-        doc_type_counts = {}
-        for doc in documents:
-            doc_type = doc["document_type"].replace("_", " ").title()
-            doc_type_counts[doc_type] = doc_type_counts.get(doc_type, 0) + 1
-
-        type_df = pd.DataFrame(list(doc_type_counts.items()), columns=["Type", "Count"])
-        st.bar_chart(type_df.set_index("Type"))
+        st.bar_chart(type_counts, x="Type", y="Count")
 
 def show_user_dashboard():
     """Main user dashboard"""
@@ -399,6 +462,9 @@ def show_user_dashboard():
     # Workflow guidance
     st.info("💡 **Tip**: As a registered user, you can manage your profile and applications here. To submit new applications, use the 'Application Form' tab above.")
 
+    if st.button("🔄 Refresh Dashboard"):
+        clear_dashboard_cache()
+
     # Dashboard tabs
     tab1, tab2, tab3, tab4 = st.tabs(["📊 Overview", "👤 Profile", "📋 Applications", "📄 Documents"])
 
@@ -414,33 +480,33 @@ def show_user_dashboard():
 
         with col1:
             applications = get_user_applications()
+            # Newest three, newest first; feeds both the quick stat and Recent Activity
+            recent_apps = heapq.nlargest(3, applications, key=itemgetter("submitted_at"))
             st.metric("Total Applications", len(applications))
 
-            if applications:
-                recent_app = max(applications, key=lambda x: x["submitted_at"])
+            if recent_apps:
+                recent_app = recent_apps[0]
                 st.write(f"**Most Recent:** Application #{recent_app['id']}")
-                st.write(f"Status: {recent_app['status'].title()}")
+                st.write(f"Status: {recent_app['status_label']}")
 
         with col2:
             documents = get_user_documents()
             st.metric("Total Documents", len(documents))
 
             if documents:
-                total_size = sum([doc.get("file_size", 0) for doc in documents])
+                total_size = sum(doc.get("file_size", 0) for doc in documents)
                 st.write(f"**Total Size:** {total_size / (1024*1024):.1f} MB")
 
         # Recent activity
         if applications:
             st.subheader("🕒 Recent Activity")
-            recent_apps = sorted(applications, key=lambda x: x["submitted_at"], reverse=True)[:3]
-
             for app in recent_apps:
                 with st.container():
                     col1, col2, col3 = st.columns([2, 1, 1])
                     with col1:
-                        st.write(f"**Application #{app['id']}** - {app['application_type'].replace('_', ' ').title()}")
+                        st.write(f"**Application #{app['id']}** - {app['type_label']}")
                     with col2:
-                        status = app['status'].title()
+                        status = app['status_label']
                         if status == "Submitted":
                             st.info(status)
                         elif status == "Processing":
@@ -450,7 +516,7 @@ def show_user_dashboard():
                         else:
                             st.error(status)
                     with col3:
-                        st.caption(datetime.fromisoformat(app["submitted_at"]).strftime("%Y-%m-%d"))
+                        st.caption(_iso_day(app["submitted_at"]))
 
     with tab2:
         show_user_profile()
@@ -12,86 +12,121 @@ Usage:
     python run_local.py --frontend-only    # Run only frontend
     python run_local.py --check-health     # Check service health
     python run_local.py --stop-all         # Stop all services
+    python run_local.py --dev              # Auto-reload the backend on code changes
+    python run_local.py --force-check      # Re-check prerequisites instead of using the 60s cache
 """
 
 import os
 import sys
 import subprocess
 import time
+import select
 import signal
+import socket
 import json
 import threading
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from dataclasses import dataclass
 from typing import Dict, List, Optional
 import argparse
 
 
 class Colors:
-    """ANSI color codes for terminal output"""
-    HEADER = '\033[95m'
-    OKBLUE = '\033[94m'
-    OKCYAN = '\033[96m'
-    OKGREEN = '\033[92m'
-    WARNING = '\033[93m'
-    FAIL = '\033[91m'
-    ENDC = '\033[0m'
-    BOLD = '\033[1m'
+    """ANSI color codes for terminal output; empty when output is not a terminal"""
+    if sys.stdout.isatty():
+        HEADER = '\033[95m'
+        OKBLUE = '\033[94m'
+        OKCYAN = '\033[96m'
+        OKGREEN = '\033[92m'
+        WARNING = '\033[93m'
+        FAIL = '\033[91m'
+        ENDC = '\033[0m'
+        BOLD = '\033[1m'
+    else:
+        HEADER = OKBLUE = OKCYAN = OKGREEN = WARNING = FAIL = ENDC = BOLD = ''
+
+    # Status prefixes, built once
+    OK = f"{OKGREEN}✅"
+    BAD = f"{FAIL}❌"
+
+
+@dataclass(frozen=True)
+class ServiceConfig:
+    """How to start and health-check one service"""
+    name: str
+    port: int
+    health_endpoint: str
+    start_command: Optional[List[str]]
+    required: bool
+    cwd: Optional[Path] = None
+
+
+PREREQ_CACHE_FILE = Path.home() / '.cache' / 'ai-social-support' / 'prereq.json'
+PREREQ_CACHE_TTL = 60  # seconds
 
 
 class ServiceManager:
     """Manages all services for the AI Social Support application"""
 
-    def __init__(self):
+    def __init__(self, force_check: bool = False, dev: bool = False):
+        self.force_check = force_check
         self.base_dir = Path(__file__).parent
         self.services = {}
         self.running = True
+        # One keep-alive session shared by every health probe, sized for
+        # concurrent probes against each local port
+        self.http = requests.Session()
+        self.http.mount('http://', HTTPAdapter(pool_connections=8, pool_maxsize=16))
 
         # Service configurations
-        self.service_configs = {
-            'ollama': {
-                'name': 'Ollama LLM Service',
-                'port': 11434,
-                'health_endpoint': 'http://localhost:11434/api/tags',
-                'start_command': None,  # Ollama should be started manually
-                'required': True
-            },
-            'backend': {
-                'name': 'FastAPI Backend',
-                'port': 8000,
-                'health_endpoint': 'http://localhost:8000/health',
-                'start_command': [
+        self.service_configs: Dict[str, ServiceConfig] = {
+            'ollama': ServiceConfig(
+                name='Ollama LLM Service',
+                port=11434,
+                health_endpoint='http://localhost:11434/api/tags',
+                start_command=None,  # Ollama should be started manually
+                required=True
+            ),
+            'backend': ServiceConfig(
+                name='FastAPI Backend',
+                port=8000,
+                health_endpoint='http://localhost:8000/health',
+                start_command=[
                     sys.executable, '-m', 'uvicorn',
                     'backend.api.main:app',
                     '--host', '0.0.0.0',
                     '--port', '8000',
-                    '--reload'
+                    # Auto-reload adds a watcher process; only in --dev runs
+                    *(['--reload', '--reload-dir', 'backend'] if dev else [])
                 ],
-                'cwd': self.base_dir,
-                'required': True
-            },
-            'chatbot': {
-                'name': 'LLM Chatbot Service',
-                'port': 8001,
-                'health_endpoint': 'http://localhost:8001/health',
-                'start_command': [
+                cwd=self.base_dir,
+                required=True
+            ),
+            'chatbot': ServiceConfig(
+                name='LLM Chatbot Service',
+                port=8001,
+                health_endpoint='http://localhost:8001/health',
+                start_command=[
                     sys.executable, 'backend/services/llm_service.py'
                 ],
-                'cwd': self.base_dir,
-                'required': False
-            },
-            'frontend': {
-                'name': 'Streamlit Frontend',
-                'port': 8501,
-                'health_endpoint': 'http://localhost:8501/_stcore/health',
-                'start_command': [
+                cwd=self.base_dir,
+                required=False
+            ),
+            'frontend': ServiceConfig(
+                name='Streamlit Frontend',
+                port=8501,
+                health_endpoint='http://localhost:8501/_stcore/health',
+                start_command=[
                     'streamlit', 'run', 'frontend/app.py',
                     '--server.port', '8501',
                     '--server.address', '0.0.0.0'
                 ],
-                'cwd': self.base_dir,
-                'required': True
-            }
+                cwd=self.base_dir,
+                required=True
+            )
         }
 
     def print_banner(self):
@@ -110,8 +145,8 @@ class ServiceManager:
         print(banner)
 
         for service_id, config in self.service_configs.items():
-            status = "🔄" if config['required'] else "⚡"
-            print(f"  {status} {config['name']} (Port {config['port']})")
+            status = "🔄" if config.required else "⚡"
+            print(f"  {status} {config.name} (Port {config.port})")
 
         print(f"\n{Colors.WARNING}Press Ctrl+C to stop all services{Colors.ENDC}\n")
 
@@ -122,13 +157,13 @@ class ServiceManager:
         # Check Python version
         python_version = sys.version_info
         if python_version < (3, 9):
-            print(f"{Colors.FAIL}❌ Python 3.9+ required, found {python_version.major}.{python_version.minor}{Colors.ENDC}")
+            print(f"{Colors.BAD} Python 3.9+ required, found {python_version.major}.{python_version.minor}{Colors.ENDC}")
             return False
-        print(f"{Colors.OKGREEN}✅ Python {python_version.major}.{python_version.minor}.{python_version.micro}{Colors.ENDC}")
+        print(f"{Colors.OK} Python {python_version.major}.{python_version.minor}.{python_version.micro}{Colors.ENDC}")
 
         # Check virtual environment
         if hasattr(sys, 'real_prefix') or (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix):
-            print(f"{Colors.OKGREEN}✅ Virtual environment active{Colors.ENDC}")
+            print(f"{Colors.OK} Virtual environment active{Colors.ENDC}")
         else:
             print(f"{Colors.WARNING}⚠️  Virtual environment not detected{Colors.ENDC}")
 
@@ -137,7 +172,7 @@ class ServiceManager:
         for dir_name in required_dirs:
             dir_path = self.base_dir / dir_name
             if dir_path.exists():
-                print(f"{Colors.OKGREEN}✅ Directory: {dir_name}{Colors.ENDC}")
+                print(f"{Colors.OK} Directory: {dir_name}{Colors.ENDC}")
             else:
                 print(f"{Colors.WARNING}⚠️  Creating directory: {dir_name}{Colors.ENDC}")
                 dir_path.mkdir(parents=True, exist_ok=True)
@@ -145,52 +180,129 @@ class ServiceManager:
         # Check .env file
         env_file = self.base_dir / '.env'
         if env_file.exists():
-            print(f"{Colors.OKGREEN}✅ Environment configuration found{Colors.ENDC}")
+            print(f"{Colors.OK} Environment configuration found{Colors.ENDC}")
         else:
             print(f"{Colors.WARNING}⚠️  .env file not found, using defaults{Colors.ENDC}")
 
         # Check Ollama
-        try:
-            result = subprocess.run(['ollama', 'list'], capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                print(f"{Colors.OKGREEN}✅ Ollama installed and accessible{Colors.ENDC}")
-                if 'qwen2:1.5b' in result.stdout:
-                    print(f"{Colors.OKGREEN}✅ qwen2:1.5b model available{Colors.ENDC}")
-                else:
-                    print(f"{Colors.WARNING}⚠️  qwen2:1.5b model not found, will use available model{Colors.ENDC}")
-            else:
-                print(f"{Colors.FAIL}❌ Ollama not working properly{Colors.ENDC}")
+        model_ok = self._cached_model_check()
+        if model_ok is None:
+            try:
+                response = self.http.get(self.service_configs['ollama'].health_endpoint, timeout=5)
+                response.raise_for_status()
+                models = [model.get('name') for model in response.json().get('models', [])]
+            except requests.exceptions.RequestException:
+                print(f"{Colors.BAD} Ollama not running or not installed{Colors.ENDC}")
+                print(f"{Colors.OKCYAN}Start with: ollama serve{Colors.ENDC}")
+                print(f"{Colors.OKCYAN}Install with: curl -fsSL https://ollama.ai/install.sh | sh{Colors.ENDC}")
                 return False
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            print(f"{Colors.FAIL}❌ Ollama not installed or not in PATH{Colors.ENDC}")
-            print(f"{Colors.OKCYAN}Install with: curl -fsSL https://ollama.ai/install.sh | sh{Colors.ENDC}")
-            return False
+            except ValueError:
+                print(f"{Colors.BAD} Ollama not working properly{Colors.ENDC}")
+                return False
+            model_ok = 'qwen2:1.5b' in models
+            self._save_model_check(model_ok)
+
+        print(f"{Colors.OK} Ollama installed and accessible{Colors.ENDC}")
+        if model_ok:
+            print(f"{Colors.OK} qwen2:1.5b model available{Colors.ENDC}")
+        else:
+            print(f"{Colors.WARNING}⚠️  qwen2:1.5b model not found, will use available model{Colors.ENDC}")
 
         return True
 
+    def _cached_model_check(self) -> Optional[bool]:
+        """Model availability from a recent successful Ollama check, or None to probe again"""
+        if self.force_check:
+            return None
+        try:
+            cached = json.loads(PREREQ_CACHE_FILE.read_text())
+            if time.time() - cached['timestamp'] < PREREQ_CACHE_TTL and cached['ollama_ok']:
+                return cached['model_ok']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def _save_model_check(self, model_ok: bool):
+        """Remember a successful Ollama check; failures are never cached"""
+        try:
+            PREREQ_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            PREREQ_CACHE_FILE.write_text(json.dumps({
+                'timestamp': time.time(),
+                'ollama_ok': True,
+                'model_ok': model_ok
+            }))
+        except OSError:
+            pass
+
     def check_service_health(self, service_id: str, timeout: int = 5) -> bool:
         """Check if a service is healthy"""
         config = self.service_configs[service_id]
         try:
-            response = requests.get(config['health_endpoint'], timeout=timeout)
+            response = self.http.get(config.health_endpoint, timeout=timeout)
             return response.status_code in [200, 404]  # 404 is OK for some services
         except requests.exceptions.RequestException:
             return False
 
+    def port_open(self, port: int) -> bool:
+        """Cheap TCP check that something is listening on a local port"""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.settimeout(0.1)
+            return sock.connect_ex(('127.0.0.1', port)) == 0
+
     def wait_for_service(self, service_id: str, timeout: int = 30) -> bool:
         """Wait for a service to become healthy"""
         config = self.service_configs[service_id]
-        print(f"  Waiting for {config['name']}...")
+        print(f"  Waiting for {config.name}...")
 
+        process = self.services.get(service_id)
         start_time = time.time()
+        # Poll quickly at first, backing off to at most every 500 ms
+        delay = 0.05
         while time.time() - start_time < timeout:
-            if self.check_service_health(service_id):
-                print(f"  {Colors.OKGREEN}✅ {config['name']} is ready{Colors.ENDC}")
+            # Only issue the HTTP health request once the port accepts connections
+            if self.port_open(config.port) and self.check_service_health(service_id):
+                print(f"  {Colors.OK} {config.name} is ready{Colors.ENDC}")
                 return True
-            time.sleep(1)
+            if process and process.poll() is not None:
+                ready = self.startup_failed(service_id, "exited during startup")
+                self.print_startup_error(service_id)
+                return ready
+            time.sleep(delay)
+            delay = min(delay * 1.5, 0.5)
+
+        return self.startup_failed(service_id, f"failed to start within {timeout}s")
+
+    def startup_failed(self, service_id: str, reason: str) -> bool:
+        """Report a service that did not come up; only a required one fails the launch"""
+        config = self.service_configs[service_id]
+        if config.required:
+            print(f"  {Colors.BAD} {config.name} {reason}{Colors.ENDC}")
+            return False
+
+        print(f"  {Colors.WARNING}⚠️  {config.name} {reason}, continuing without it (optional){Colors.ENDC}")
+        process = self.services.pop(service_id, None)
+        if process and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        return True
+
+    def log_path(self, service_id: str) -> Path:
+        """File that collects a service's stderr"""
+        return self.base_dir / 'logs' / f'{service_id}.log'
 
-        print(f"  {Colors.FAIL}❌ {config['name']} failed to start within {timeout}s{Colors.ENDC}")
-        return False
+    def print_startup_error(self, service_id: str):
+        """Show the end of a service's log after it failed to start"""
+        try:
+            error = self.log_path(service_id).read_text(errors='replace').strip()
+        except OSError:
+            return
+        if error:
+            print(f"  Error: ...{error[-200:]}")
+            print(f"  Full log: {self.log_path(service_id)}")
 
     def start_service(self, service_id: str) -> Optional[subprocess.Popen]:
         """Start a single service"""
@@ -199,42 +311,41 @@ class ServiceManager:
         if service_id == 'ollama':
             # Check if Ollama is already running
             if self.check_service_health('ollama'):
-                print(f"  {Colors.OKGREEN}✅ {config['name']} already running{Colors.ENDC}")
+                print(f"  {Colors.OK} {config.name} already running{Colors.ENDC}")
                 return None
             else:
-                print(f"  {Colors.FAIL}❌ Ollama not running. Please start with: ollama serve{Colors.ENDC}")
+                print(f"  {Colors.BAD} Ollama not running. Please start with: ollama serve{Colors.ENDC}")
                 return None
 
-        print(f"  🚀 Starting {config['name']}...")
+        print(f"  🚀 Starting {config.name}...")
 
         try:
             # Set up environment
             env = os.environ.copy()
             env['PYTHONPATH'] = str(self.base_dir)
 
-            process = subprocess.Popen(
-                config['start_command'],
-                cwd=config.get('cwd', self.base_dir),
-                env=env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-
-            # Give the service a moment to start
-            time.sleep(2)
+            # Nothing reads the service's output while it runs, so a pipe would
+            # eventually fill and block it; stderr goes to logs/<service>.log
+            log_path = self.log_path(service_id)
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(log_path, 'w') as log_file:
+                process = subprocess.Popen(
+                    config.start_command,
+                    cwd=config.cwd or self.base_dir,
+                    env=env,
+                    stdout=subprocess.DEVNULL,
+                    stderr=log_file
+                )
 
             if process.poll() is None:
                 return process
             else:
-                stdout, stderr = process.communicate()
-                print(f"  {Colors.FAIL}❌ {config['name']} failed to start{Colors.ENDC}")
-                if stderr:
-                    print(f"  Error: {stderr[:200]}...")
+                print(f"  {Colors.BAD} {config.name} failed to start{Colors.ENDC}")
+                self.print_startup_error(service_id)
                 return None
 
         except Exception as e:
-            print(f"  {Colors.FAIL}❌ Failed to start {config['name']}: {e}{Colors.ENDC}")
+            print(f"  {Colors.BAD} Failed to start {config.name}: {e}{Colors.ENDC}")
             return None
 
     def start_all_services(self, backend_only: bool = False, frontend_only: bool = False):
@@ -250,7 +361,8 @@ class ServiceManager:
         else:
             services_to_start = list(self.service_configs.keys())
 
-        # Start services in order
+        # Spawn everything first so the services boot side by side; Ollama is
+        # never spawned here, it must already be running
         for service_id in services_to_start:
             process = self.start_service(service_id)
             if process:
@@ -258,18 +370,19 @@ class ServiceManager:
 
         # Wait for services to be ready
         print(f"\n{Colors.OKBLUE}Waiting for services to be ready...{Colors.ENDC}")
-        all_ready = True
-
-        for service_id in services_to_start:
-            if service_id in self.services or service_id == 'ollama':
-                if not self.wait_for_service(service_id):
-                    all_ready = False
+        waiting = [
+            service_id for service_id in services_to_start
+            if service_id in self.services or service_id == 'ollama'
+        ]
+        # Wait on every service at once so the total is the slowest start, not the sum
+        with ThreadPoolExecutor(max_workers=max(len(waiting), 1)) as executor:
+            all_ready = all(list(executor.map(self.wait_for_service, waiting)))
 
         if all_ready:
             self.print_service_urls()
             return True
         else:
-            print(f"\n{Colors.FAIL}❌ Some services failed to start properly{Colors.ENDC}")
+            print(f"\n{Colors.BAD} Some services failed to start properly{Colors.ENDC}")
             return False
 
     def print_service_urls(self):
@@ -291,31 +404,51 @@ class ServiceManager:
         """Stop all running services"""
         print(f"\n{Colors.WARNING}Stopping all services...{Colors.ENDC}")
 
+        # Signal every service first so they all shut down in parallel
+        pending = {}
         for service_id, process in self.services.items():
             config = self.service_configs[service_id]
-            print(f"  🛑 Stopping {config['name']}...")
-
+            print(f"  🛑 Stopping {config.name}...")
             try:
                 process.terminate()
-                process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                print(f"  ⚡ Force killing {config['name']}...")
+                pending[service_id] = process
+            except Exception as e:
+                print(f"  ⚠️  Error stopping {config.name}: {e}")
+
+        # One shared 5s grace period, rather than up to 5s per service
+        deadline = time.monotonic() + 5
+        while pending and time.monotonic() < deadline:
+            for service_id, process in list(pending.items()):
+                if process.poll() is not None:
+                    del pending[service_id]
+            if pending:
+                time.sleep(0.05)
+
+        for service_id, process in pending.items():
+            config = self.service_configs[service_id]
+            print(f"  ⚡ Force killing {config.name}...")
+            try:
                 process.kill()
                 process.wait()
             except Exception as e:
-                print(f"  ⚠️  Error stopping {config['name']}: {e}")
+                print(f"  ⚠️  Error stopping {config.name}: {e}")
 
-        print(f"{Colors.OKGREEN}✅ All services stopped{Colors.ENDC}")
+        print(f"{Colors.OK} All services stopped{Colors.ENDC}")
 
     def check_all_health(self):
         """Check health of all services"""
         print(f"{Colors.OKBLUE}Checking service health...{Colors.ENDC}")
 
-        for service_id, config in self.service_configs.items():
-            if self.check_service_health(service_id):
-                print(f"  {Colors.OKGREEN}✅ {config['name']} (Port {config['port']}){Colors.ENDC}")
+        service_ids = list(self.service_configs)
+        with ThreadPoolExecutor(max_workers=len(service_ids)) as executor:
+            results = executor.map(self.check_service_health, service_ids)
+
+        for service_id, healthy in zip(service_ids, results):
+            config = self.service_configs[service_id]
+            if healthy:
+                print(f"  {Colors.OK} {config.name} (Port {config.port}){Colors.ENDC}")
             else:
-                print(f"  {Colors.FAIL}❌ {config['name']} (Port {config['port']}){Colors.ENDC}")
+                print(f"  {Colors.BAD} {config.name} (Port {config.port}){Colors.ENDC}")
 
     def signal_handler(self, signum, frame):
         """Handle Ctrl+C gracefully"""
@@ -324,6 +457,44 @@ class ServiceManager:
         self.stop_all_services()
         sys.exit(0)
 
+    def child_exited(self, signum, frame):
+        """Handle SIGCHLD: stop as soon as a required service dies"""
+        for service_id, process in list(self.services.items()):
+            if process.poll() is None:
+                continue
+            config = self.service_configs[service_id]
+            if config.required:
+                print(f"\n{Colors.BAD} {config.name} exited unexpectedly{Colors.ENDC}")
+                self.running = False
+            else:
+                # Forget it so later SIGCHLDs don't report it again
+                print(f"\n{Colors.WARNING}⚠️  {config.name} exited, continuing without it (optional){Colors.ENDC}")
+                del self.services[service_id]
+
+    def wait_until_stopped(self):
+        """Sleep until Ctrl+C or, on POSIX, until a required service exits"""
+        if not hasattr(signal, 'SIGCHLD'):
+            while self.running:
+                time.sleep(1)
+            return
+
+        # Signals write to a self-pipe, so one arriving just before select()
+        # still wakes it; there are no periodic wakeups in between
+        wakeup_read, wakeup_write = os.pipe()
+        os.set_blocking(wakeup_write, False)
+        previous_fd = signal.set_wakeup_fd(wakeup_write)
+        signal.signal(signal.SIGCHLD, self.child_exited)
+        try:
+            self.child_exited(None, None)  # catch a service that died before the handler was set
+            while self.running:
+                select.select([wakeup_read], [], [])
+                os.read(wakeup_read, 512)
+        finally:
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            signal.set_wakeup_fd(previous_fd)
+            os.close(wakeup_read)
+            os.close(wakeup_write)
+
     def run(self, backend_only: bool = False, frontend_only: bool = False):
         """Main run method"""
         # Set up signal handler
@@ -332,14 +503,13 @@ class ServiceManager:
         self.print_banner()
 
         if not self.check_prerequisites():
-            print(f"\n{Colors.FAIL}❌ Prerequisites not met. Please fix the issues above.{Colors.ENDC}")
+            print(f"\n{Colors.BAD} Prerequisites not met. Please fix the issues above.{Colors.ENDC}")
             return False
 
         if self.start_all_services(backend_only, frontend_only):
             # Keep the main thread alive
             try:
-                while self.running:
-                    time.sleep(1)
+                self.wait_until_stopped()
             except KeyboardInterrupt:
                 pass
             finally:
@@ -357,10 +527,12 @@ def main():
     parser.add_argument('--frontend-only', action='store_true', help='Run only frontend')
     parser.add_argument('--check-health', action='store_true', help='Check service health')
     parser.add_argument('--stop-all', action='store_true', help='Stop all services')
+    parser.add_argument('--dev', action='store_true', help='Restart the backend on code changes')
+    parser.add_argument('--force-check', action='store_true', help='Ignore cached prerequisite results')
 
     args = parser.parse_args()
 
-    manager = ServiceManager()
+    manager = ServiceManager(force_check=args.force_check, dev=args.dev)
 
     if args.check_health:
         manager.check_all_health()
@@ -2,35 +2,46 @@
 """
 Startup script for AI Social Support Application with Authentication
 Runs all required services: Auth API, Main API, Chat API, and Frontend
+Set AUTORELOAD=1 to restart the API servers on code changes
 """
 
+import importlib.util
+import selectors
 import subprocess
 import threading
 import time
 import os
 import signal
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Project directory; servers are launched from here so relative paths resolve
+BASE_DIR = Path(__file__).resolve().parent
+
+# AUTORELOAD=1 restarts the API servers on code changes; it adds a file watcher
+# process per server, so it is off unless asked for
+RELOAD_ARGS = ["--reload", "--reload-dir", "backend"] if os.environ.get("AUTORELOAD") == "1" else []
+
 # Server configurations
 SERVERS = [
     {
         "name": "Authentication API",
-        "command": ["python", "-m", "uvicorn", "backend.api.auth_server:app", "--host", "0.0.0.0", "--port", "8002", "--reload"],
+        "command": ["python", "-m", "uvicorn", "backend.api.auth_server:app", "--host", "0.0.0.0", "--port", "8002", *RELOAD_ARGS],
         "port": 8002,
         "url": "http://localhost:8002",
         "health_endpoint": "/auth/health"
     },
     {
         "name": "Main API Server",
-        "command": ["python", "-m", "uvicorn", "backend.api.simple_server:app", "--host", "0.0.0.0", "--port", "8000", "--reload"],
+        "command": ["python", "-m", "uvicorn", "backend.api.simple_server:app", "--host", "0.0.0.0", "--port", "8000", *RELOAD_ARGS],
         "port": 8000,
         "url": "http://localhost:8000",
         "health_endpoint": "/health"
     },
     {
         "name": "Chat API Server",
-        "command": ["python", "-m", "uvicorn", "backend.api.chat_server:app", "--host", "0.0.0.0", "--port", "8001", "--reload"],
+        "command": ["python", "-m", "uvicorn", "backend.api.chat_server:app", "--host", "0.0.0.0", "--port", "8001", *RELOAD_ARGS],
         "port": 8001,
         "url": "http://localhost:8001",
         "health_endpoint": "/chat/health"
@@ -44,35 +55,81 @@ SERVERS = [
     }
 ]
 
+# Distribution names whose import name differs
+MODULE_NAMES = {
+    "PyJWT": "jwt",
+    "python-jose": "jose",
+}
+
 # Global list to track processes
 processes = []
 
 def run_server(server_config):
-    """Run a single server"""
+    """Start a single server; returns the process, or None if it could not be started"""
     try:
         print(f"🚀 Starting {server_config['name']} on port {server_config['port']}...")
 
-        # Change to project directory
-        os.chdir(Path(__file__).parent)
-
+        # stderr is merged into stdout so a single pipe per server is drained;
+        # the pipe is unbuffered bytes so the relay sees data as soon as it is written
         process = subprocess.Popen(
             server_config['command'],
+            cwd=BASE_DIR,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
+            stderr=subprocess.STDOUT,
+            bufsize=0
         )
 
         processes.append(process)
-
-        # Print output
-        for line in iter(process.stdout.readline, ''):
-            if line:
-                print(f"[{server_config['name']}] {line.strip()}")
+        return process
 
     except Exception as e:
         print(f"❌ Failed to start {server_config['name']}: {e}")
+        return None
+
+def print_lines(name, pending, chunk):
+    """Print the complete lines in pending + chunk; returns the unfinished tail"""
+    *lines, tail = (pending + chunk).split(b"\n")
+    for line in lines:
+        text = line.decode(errors="replace").strip()
+        if text:
+            print(f"[{name}] {text}")
+    return tail
+
+def stream_output(running):
+    """Print every server's output from one thread, prefixed with the server name
+
+    running is a list of (name, process) pairs. Pipes are non-blocking and read
+    in raw chunks, so every line a chunk completes is printed straight away; each
+    pipe is dropped at EOF and the loop ends once all servers have exited.
+    """
+    pending = {}
+    with selectors.DefaultSelector() as selector:
+        for name, process in running:
+            fd = process.stdout.fileno()
+            os.set_blocking(fd, False)
+            selector.register(fd, selectors.EVENT_READ, name)
+            pending[fd] = b""
+
+        while selector.get_map():
+            for key, _ in selector.select(timeout=0.5):
+                fd = key.fd
+                try:
+                    chunk = os.read(fd, 65536)
+                except BlockingIOError:
+                    continue
+                if chunk:
+                    pending[fd] = print_lines(key.data, pending[fd], chunk)
+                else:
+                    print_lines(key.data, pending.pop(fd), b"\n")
+                    selector.unregister(fd)
+
+def pump_output(name, process):
+    """Print one server's output; used where pipes cannot be selected on"""
+    fd = process.stdout.fileno()
+    pending = b""
+    for chunk in iter(lambda: os.read(fd, 65536), b""):
+        pending = print_lines(name, pending, chunk)
+    print_lines(name, pending, b"\n")
 
 def check_dependencies():
     """Check if required dependencies are installed"""
@@ -83,13 +140,11 @@ def check_dependencies():
         "bcrypt", "PyJWT", "python-jose", "requests"
     ]
 
-    missing_packages = []
-
-    for package in required_packages:
-        try:
-            __import__(package.replace("-", "_"))
-        except ImportError:
-            missing_packages.append(package)
+    # find_spec only locates each module, without running its import-time code
+    missing_packages = [
+        package for package in required_packages
+        if importlib.util.find_spec(MODULE_NAMES.get(package, package)) is None
+    ]
 
     if missing_packages:
         print(f"❌ Missing packages: {', '.join(missing_packages)}")
@@ -118,27 +173,41 @@ def check_ollama():
         print("📥 Install model with: ollama pull qwen2:1.5b")
         return False
 
-def wait_for_startup():
+def wait_for_startup(timeout=30):
     """Wait for servers to start up"""
     print("⏳ Waiting for servers to start...")
-    time.sleep(10)
 
     # Check server health
     import requests
 
-    for server in SERVERS[:3]:  # Skip frontend health check
-        if server["health_endpoint"]:
+    def probe(server):
+        # Retry until the server answers 200 or the deadline passes, backing off
+        # from 50 ms to 500 ms; the last status or error is reported
+        deadline = time.time() + timeout
+        delay = 0.05
+        while True:
             try:
-                response = requests.get(
-                    server["url"] + server["health_endpoint"],
-                    timeout=5
-                )
-                if response.status_code == 200:
-                    print(f"✅ {server['name']} is healthy")
-                else:
-                    print(f"⚠️ {server['name']} returned status {response.status_code}")
+                result = session.get(server["url"] + server["health_endpoint"], timeout=5).status_code
             except Exception as e:
-                print(f"❌ {server['name']} health check failed: {e}")
+                result = e
+            if result == 200 or time.time() >= deadline:
+                return result
+            time.sleep(delay)
+            delay = min(delay * 1.5, 0.5)
+
+    servers = [server for server in SERVERS[:3] if server["health_endpoint"]]  # Skip frontend health check
+
+    # Probe all servers at once over one keep-alive session; report in the usual order
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=len(servers)) as executor:
+        results = list(executor.map(probe, servers))
+
+    for server, result in zip(servers, results):
+        if isinstance(result, Exception):
+            print(f"❌ {server['name']} health check failed: {result}")
+        elif result == 200:
+            print(f"✅ {server['name']} is healthy")
+        else:
+            print(f"⚠️ {server['name']} returned status {result}")
 
 def signal_handler(sig, frame):
     """Handle Ctrl+C gracefully"""
@@ -177,14 +246,21 @@ def main():
     print("\n🚀 Starting all services...")
     print("=" * 60)
 
-    # Start servers in threads
-    threads = []
+    # Start all servers at once; they boot independently
+    running = []
     for server in SERVERS:
-        thread = threading.Thread(target=run_server, args=(server,))
-        thread.daemon = True
+        process = run_server(server)
+        if process:
+            running.append((server['name'], process))
+
+    # One thread relays all output; Windows cannot select() on pipes, so it
+    # keeps a reader thread per server
+    if sys.platform == "win32":
+        readers = [threading.Thread(target=pump_output, args=pair, daemon=True) for pair in running]
+    else:
+        readers = [threading.Thread(target=stream_output, args=(running,), daemon=True)]
+    for thread in readers:
         thread.start()
-        threads.append(thread)
-        time.sleep(2)  # Stagger startup
 
     # Wait for startup
     wait_for_startup()
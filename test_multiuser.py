@@ -4,6 +4,10 @@ Test script for multi-user functionality
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
 import json
 import time
 from datetime import datetime
@@ -12,240 +16,229 @@ from datetime import datetime
 AUTH_API = "http://localhost:8002"
 MAIN_API = "http://localhost:8000"
 
+# One keep-alive session for every call, so each API's connection is reused
+SESSION = requests.Session()
+for base_url in (AUTH_API, MAIN_API):
+    SESSION.mount(base_url, HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+@dataclass(frozen=True)
+class UserFixture:
+    """Account, profile, application and document data for one test user"""
+    email: str
+    password: str
+    full_name: str
+    first_name: str
+    last_name: str
+    phone: str
+    emirates_id: str
+    address: str
+    family_size: int
+    employment_status: str
+    monthly_income: int
+    application_type: str
+    urgency_level: str
+    documents: Tuple[Dict[str, Any], ...]
+
+# Test users, built once; every phase runs the same steps for each of them
+USERS = (
+    UserFixture(
+        email="john.doe@example.com",
+        password="TestPassword123",
+        full_name="John Doe",
+        first_name="John",
+        last_name="Doe",
+        phone="+971501234567",
+        emirates_id="784-1234-1234567-1",
+        address="Dubai, UAE",
+        family_size=3,
+        employment_status="employed",
+        monthly_income=8000,
+        application_type="financial_support",
+        urgency_level="high",
+        documents=(
+            {
+                "filename": "john_emirates_id.pdf",
+                "type": "emirates_id",
+                "size": 512000,
+                "content_type": "application/pdf"
+            },
+            {
+                "filename": "john_bank_statement.pdf",
+                "type": "bank_statement",
+                "size": 1024000,
+                "content_type": "application/pdf"
+            }
+        )
+    ),
+    UserFixture(
+        email="jane.smith@example.com",
+        password="SecurePass456",
+        full_name="Jane Smith",
+        first_name="Jane",
+        last_name="Smith",
+        phone="+971509876543",
+        emirates_id="784-5678-7654321-2",
+        address="Abu Dhabi, UAE",
+        family_size=2,
+        employment_status="self_employed",
+        monthly_income=5000,
+        application_type="economic_enablement",
+        urgency_level="normal",
+        documents=(
+            {
+                "filename": "jane_emirates_id.jpg",
+                "type": "emirates_id",
+                "size": 256000,
+                "content_type": "image/jpeg"
+            },
+            {
+                "filename": "jane_business_license.pdf",
+                "type": "resume",
+                "size": 768000,
+                "content_type": "application/pdf"
+            }
+        )
+    ),
+)
+
+# The test users are independent, so each phase sends all users' requests at once
+EXECUTOR = ThreadPoolExecutor(max_workers=len(USERS))
+
+def send_for_users(request, *per_user):
+    """Call request(user, *args) for every user concurrently; responses come back in user order
+
+    Each of per_user is a sequence with one value per user, such as tokens.
+    """
+    return list(EXECUTOR.map(request, USERS, *per_user))
+
+def auth_headers(token):
+    """Bearer header for one user's token"""
+    return {"Authorization": f"Bearer {token}"}
+
 def test_user_registration():
     """Test user registration"""
     print("🔐 Testing User Registration...")
 
-    # Test user 1
-    user1_data = {
-        "email": "john.doe@example.com",
-        "password": "TestPassword123",
-        "full_name": "John Doe",
-        "phone": "+971501234567"
-    }
-
-    response = requests.post(f"{AUTH_API}/auth/register", json=user1_data)
-    print(f"User 1 registration: {response.status_code}")
-
-    if response.status_code == 200:
-        user1_token = response.json()["access_token"]
-        print(f"✅ User 1 registered successfully")
-        print(f"Token: {user1_token[:20]}...")
-    else:
-        print(f"❌ User 1 registration failed: {response.text}")
-        return None, None
-
-    # Test user 2
-    user2_data = {
-        "email": "jane.smith@example.com",
-        "password": "SecurePass456",
-        "full_name": "Jane Smith",
-        "phone": "+971509876543"
-    }
-
-    response = requests.post(f"{AUTH_API}/auth/register", json=user2_data)
-    print(f"User 2 registration: {response.status_code}")
-
-    if response.status_code == 200:
-        user2_token = response.json()["access_token"]
-        print(f"✅ User 2 registered successfully")
-        print(f"Token: {user2_token[:20]}...")
-    else:
-        print(f"❌ User 2 registration failed: {response.text}")
-        return user1_token, None
+    responses = send_for_users(lambda user: SESSION.post(f"{AUTH_API}/auth/register", json={
+        "email": user.email,
+        "password": user.password,
+        "full_name": user.full_name,
+        "phone": user.phone
+    }))
+
+    tokens = []
+    for number, response in enumerate(responses, 1):
+        print(f"User {number} registration: {response.status_code}")
+
+        if response.status_code == 200:
+            token = response.json()["access_token"]
+            print(f"✅ User {number} registered successfully")
+            print(f"Token: {token[:20]}...")
+        else:
+            print(f"❌ User {number} registration failed: {response.text}")
+            token = None
+        tokens.append(token)
 
-    return user1_token, user2_token
+    return tokens
 
-def test_user_profiles(user1_token, user2_token):
+def test_user_profiles(tokens):
     """Test user profile management"""
     print("\n👤 Testing User Profiles...")
 
-    # Update user 1 profile
-    user1_profile = {
-        "emirates_id": "784-1234-1234567-1",
-        "address": "Dubai, UAE",
-        "family_size": 3,
-        "employment_status": "employed",
-        "monthly_income": 8000.0
-    }
-
-    headers1 = {"Authorization": f"Bearer {user1_token}"}
-    response = requests.put(f"{AUTH_API}/users/profile", json=user1_profile, headers=headers1)
-    print(f"User 1 profile update: {response.status_code}")
-
-    if response.status_code == 200:
-        print("✅ User 1 profile updated successfully")
-    else:
-        print(f"❌ User 1 profile update failed: {response.text}")
-
-    # Update user 2 profile
-    user2_profile = {
-        "emirates_id": "784-5678-7654321-2",
-        "address": "Abu Dhabi, UAE",
-        "family_size": 2,
-        "employment_status": "self_employed",
-        "monthly_income": 5000.0
-    }
+    responses = send_for_users(lambda user, token: SESSION.put(f"{AUTH_API}/users/profile", json={
+        "emirates_id": user.emirates_id,
+        "address": user.address,
+        "family_size": user.family_size,
+        "employment_status": user.employment_status,
+        "monthly_income": float(user.monthly_income)
+    }, headers=auth_headers(token)), tokens)
 
-    headers2 = {"Authorization": f"Bearer {user2_token}"}
-    response = requests.put(f"{AUTH_API}/users/profile", json=user2_profile, headers=headers2)
-    print(f"User 2 profile update: {response.status_code}")
+    for number, response in enumerate(responses, 1):
+        print(f"User {number} profile update: {response.status_code}")
 
-    if response.status_code == 200:
-        print("✅ User 2 profile updated successfully")
-    else:
-        print(f"❌ User 2 profile update failed: {response.text}")
+        if response.status_code == 200:
+            print(f"✅ User {number} profile updated successfully")
+        else:
+            print(f"❌ User {number} profile update failed: {response.text}")
 
-def test_applications(user1_token, user2_token):
+def test_applications(tokens):
     """Test application submission with user isolation"""
     print("\n📋 Testing Application Submission...")
 
-    # User 1 application
-    user1_app = {
-        "first_name": "John",
-        "last_name": "Doe",
-        "emirates_id": "784-1234-1234567-1",
-        "email": "john.doe@example.com",
-        "phone": "+971501234567",
-        "application_type": "financial_support",
-        "urgency_level": "high",
-        "monthly_income": 8000,
-        "family_size": 3,
-        "employment_status": "employed"
-    }
-
-    headers1 = {"Authorization": f"Bearer {user1_token}"}
-    response = requests.post(f"{MAIN_API}/applications/submit", json=user1_app, headers=headers1)
-    print(f"User 1 application: {response.status_code}")
-
-    if response.status_code == 200:
-        user1_app_id = response.json()["application_id"]
-        print(f"✅ User 1 application submitted: ID {user1_app_id}")
-    else:
-        print(f"❌ User 1 application failed: {response.text}")
-        return None, None
-
-    # User 2 application
-    user2_app = {
-        "first_name": "Jane",
-        "last_name": "Smith",
-        "emirates_id": "784-5678-7654321-2",
-        "email": "jane.smith@example.com",
-        "phone": "+971509876543",
-        "application_type": "economic_enablement",
-        "urgency_level": "normal",
-        "monthly_income": 5000,
-        "family_size": 2,
-        "employment_status": "self_employed"
-    }
-
-    headers2 = {"Authorization": f"Bearer {user2_token}"}
-    response = requests.post(f"{MAIN_API}/applications/submit", json=user2_app, headers=headers2)
-    print(f"User 2 application: {response.status_code}")
-
-    if response.status_code == 200:
-        user2_app_id = response.json()["application_id"]
-        print(f"✅ User 2 application submitted: ID {user2_app_id}")
-    else:
-        print(f"❌ User 2 application failed: {response.text}")
-        return user1_app_id, None
+    responses = send_for_users(lambda user, token: SESSION.post(f"{MAIN_API}/applications/submit", json={
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "emirates_id": user.emirates_id,
+        "email": user.email,
+        "phone": user.phone,
+        "application_type": user.application_type,
+        "urgency_level": user.urgency_level,
+        "monthly_income": user.monthly_income,
+        "family_size": user.family_size,
+        "employment_status": user.employment_status
+    }, headers=auth_headers(token)), tokens)
+
+    app_ids = []
+    for number, response in enumerate(responses, 1):
+        print(f"User {number} application: {response.status_code}")
+
+        if response.status_code == 200:
+            app_id = response.json()["application_id"]
+            print(f"✅ User {number} application submitted: ID {app_id}")
+        else:
+            print(f"❌ User {number} application failed: {response.text}")
+            app_id = None
+        app_ids.append(app_id)
 
-    return user1_app_id, user2_app_id
+    return app_ids
 
-def test_documents(user1_token, user2_token, user1_app_id, user2_app_id):
+def test_documents(tokens, app_ids):
     """Test document upload with user isolation"""
     print("\n📄 Testing Document Upload...")
 
-    # User 1 documents
-    user1_docs = [
-        {
-            "filename": "john_emirates_id.pdf",
-            "type": "emirates_id",
-            "size": 512000,
-            "content_type": "application/pdf"
-        },
-        {
-            "filename": "john_bank_statement.pdf",
-            "type": "bank_statement",
-            "size": 1024000,
-            "content_type": "application/pdf"
-        }
-    ]
-
-    headers1 = {"Authorization": f"Bearer {user1_token}"}
-    response = requests.post(
-        f"{MAIN_API}/applications/{user1_app_id}/documents/upload",
-        json=user1_docs,
-        headers=headers1
-    )
-    print(f"User 1 documents: {response.status_code}")
+    responses = send_for_users(lambda user, token, app_id: SESSION.post(
+        f"{MAIN_API}/applications/{app_id}/documents/upload",
+        json=list(user.documents),
+        headers=auth_headers(token)
+    ), tokens, app_ids)
 
-    if response.status_code == 200:
-        print(f"✅ User 1 uploaded {len(user1_docs)} documents")
-    else:
-        print(f"❌ User 1 document upload failed: {response.text}")
-
-    # User 2 documents
-    user2_docs = [
-        {
-            "filename": "jane_emirates_id.jpg",
-            "type": "emirates_id",
-            "size": 256000,
-            "content_type": "image/jpeg"
-        },
-        {
-            "filename": "jane_business_license.pdf",
-            "type": "resume",
-            "size": 768000,
-            "content_type": "application/pdf"
-        }
-    ]
-
-    headers2 = {"Authorization": f"Bearer {user2_token}"}
-    response = requests.post(
-        f"{MAIN_API}/applications/{user2_app_id}/documents/upload",
-        json=user2_docs,
-        headers=headers2
-    )
-    print(f"User 2 documents: {response.status_code}")
+    for number, (user, response) in enumerate(zip(USERS, responses), 1):
+        print(f"User {number} documents: {response.status_code}")
 
-    if response.status_code == 200:
-        print(f"✅ User 2 uploaded {len(user2_docs)} documents")
-    else:
-        print(f"❌ User 2 document upload failed: {response.text}")
+        if response.status_code == 200:
+            print(f"✅ User {number} uploaded {len(user.documents)} documents")
+        else:
+            print(f"❌ User {number} document upload failed: {response.text}")
 
-def test_data_isolation(user1_token, user2_token):
+def test_data_isolation(tokens):
     """Test that users can only see their own data"""
     print("\n🔒 Testing Data Isolation...")
 
-    # User 1 gets their applications
-    headers1 = {"Authorization": f"Bearer {user1_token}"}
-    response = requests.get(f"{AUTH_API}/users/applications", headers=headers1)
-    print(f"User 1 applications fetch: {response.status_code}")
-
-    if response.status_code == 200:
-        user1_apps = response.json()["applications"]
-        print(f"✅ User 1 has {len(user1_apps)} applications")
-    else:
-        print(f"❌ User 1 applications fetch failed: {response.text}")
+    # Each user gets their applications
+    responses = send_for_users(
+        lambda user, token: SESSION.get(f"{AUTH_API}/users/applications", headers=auth_headers(token)),
+        tokens
+    )
 
-    # User 2 gets their applications
-    headers2 = {"Authorization": f"Bearer {user2_token}"}
-    response = requests.get(f"{AUTH_API}/users/applications", headers=headers2)
-    print(f"User 2 applications fetch: {response.status_code}")
+    user_app_ids = []
+    for number, response in enumerate(responses, 1):
+        print(f"User {number} applications fetch: {response.status_code}")
 
-    if response.status_code == 200:
-        user2_apps = response.json()["applications"]
-        print(f"✅ User 2 has {len(user2_apps)} applications")
-    else:
-        print(f"❌ User 2 applications fetch failed: {response.text}")
+        if response.status_code == 200:
+            apps = response.json()["applications"]
+            print(f"✅ User {number} has {len(apps)} applications")
+            user_app_ids.append({app["id"] for app in apps})
+        else:
+            print(f"❌ User {number} applications fetch failed: {response.text}")
 
     # Verify isolation
-    if 'user1_apps' in locals() and 'user2_apps' in locals():
-        user1_ids = [app["id"] for app in user1_apps]
-        user2_ids = [app["id"] for app in user2_apps]
+    if len(user_app_ids) == len(USERS):
+        seen = set()
+        overlap = set()
+        for app_ids in user_app_ids:
+            overlap |= seen & app_ids
+            seen |= app_ids
 
-        overlap = set(user1_ids) & set(user2_ids)
         if not overlap:
             print("✅ Data isolation verified: No overlap between user applications")
         else:
@@ -264,7 +257,7 @@ def test_anonymous_vs_authenticated():
         "application_type": "financial_support"
     }
 
-    response = requests.post(f"{MAIN_API}/applications/submit", json=anon_app)
+    response = SESSION.post(f"{MAIN_API}/applications/submit", json=anon_app)
     print(f"Anonymous application: {response.status_code}")
 
     if response.status_code == 200:
@@ -283,9 +276,13 @@ def main():
         # Check if services are running
         print("🔍 Checking services...")
 
+        # Probe both services at once; a down service costs one timeout, not two
+        auth_health = EXECUTOR.submit(SESSION.get, f"{AUTH_API}/auth/health", timeout=5)
+        main_health = EXECUTOR.submit(SESSION.get, f"{MAIN_API}/health", timeout=5)
+
         # Check auth service
         try:
-            response = requests.get(f"{AUTH_API}/auth/health", timeout=5)
+            response = auth_health.result()
             if response.status_code == 200:
                 print("✅ Auth service is running")
             else:
@@ -298,7 +295,7 @@ def main():
 
         # Check main API
         try:
-            response = requests.get(f"{MAIN_API}/health", timeout=5)
+            response = main_health.result()
             if response.status_code == 200:
                 print("✅ Main API is running")
             else:
@@ -311,20 +308,20 @@ def main():
         print("\n🚀 Starting tests...")
 
         # Run tests
-        user1_token, user2_token = test_user_registration()
-        if not user1_token or not user2_token:
+        tokens = test_user_registration()
+        if not all(tokens):
             print("❌ Cannot continue without user tokens")
             return
 
-        test_user_profiles(user1_token, user2_token)
+        test_user_profiles(tokens)
 
-        user1_app_id, user2_app_id = test_applications(user1_token, user2_token)
-        if not user1_app_id or not user2_app_id:
+        app_ids = test_applications(tokens)
+        if not all(app_ids):
             print("❌ Cannot continue without application IDs")
             return
 
-        test_documents(user1_token, user2_token, user1_app_id, user2_app_id)
-        test_data_isolation(user1_token, user2_token)
+        test_documents(tokens, app_ids)
+        test_data_isolation(tokens)
         test_anonymous_vs_authenticated()
 
         print("\n🎉 All tests completed!")
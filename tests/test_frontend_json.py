@@ -0,0 +1,36 @@
+"""
+Tests for the frontend's JSON response decoding
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("streamlit")
+requests = pytest.importorskip("requests")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "frontend"))
+
+import app  # noqa: E402
+
+
+def _response(body: bytes) -> "requests.Response":
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.headers["Content-Type"] = "application/json"
+    return response
+
+
+def test_json_without_orjson(monkeypatch):
+    """The stdlib fallback decodes the body instead of recursing"""
+    monkeypatch.setattr(app, "orjson", None)
+    assert app._json(_response(b'{"status": "ok", "ids": [1, 2]}')) == {"status": "ok", "ids": [1, 2]}
+
+
+def test_json_with_orjson(monkeypatch):
+    """orjson, when installed, decodes the same body"""
+    orjson = pytest.importorskip("orjson")
+    monkeypatch.setattr(app, "orjson", orjson)
+    assert app._json(_response(b'{"status": "ok", "ids": [1, 2]}')) == {"status": "ok", "ids": [1, 2]}